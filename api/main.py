@@ -1,12 +1,20 @@
 import sys, pathlib
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import Any, Optional
 from fairmeta.ingest import normalize_record
 from fairmeta.enrich import enrich_record
 from fairmeta.fair_scoring import score_record
-from fairmeta.report import write_reports
+from fairmeta.rules import ProfileError, available_profiles, get_plan
+from fairmeta.score_cache import make_cache, canonical_key
+from fairmeta.report import write_reports, render_markdown
+from fairmeta.batching import MicroBatcher, BatcherOverloaded
+from fairmeta.config import ENRICH_BATCH_MAX_SIZE, ENRICH_BATCH_MAX_WAIT_MS, ENRICH_QUEUE_LIMIT
+from fairmeta.catalogue import get_catalogue, SORTABLE_COLUMNS, SEARCH_FIELDS
+from fairmeta.history import get_history, BUCKETS
+from fairmeta.dedup import get_index
 
 app = FastAPI(title="FAIRMeta AI", version="1.0.0")
 
@@ -27,12 +35,147 @@ class MetadataIn(BaseModel):
     issued: Optional[str] = ""
     modified: Optional[str] = ""
 
+class AdvancedIn(BaseModel):
+    title: Optional[str] = ""
+    description: Optional[str] = ""
+
+def _enrich_advanced_batch(items):
+    from fairmeta.advanced_nlp import enrich_text_advanced_batch
+    return enrich_text_advanced_batch(items)
+
+score_cache = make_cache()
+
+enrich_batcher = MicroBatcher(_enrich_advanced_batch, max_batch_size=ENRICH_BATCH_MAX_SIZE,
+                              max_wait_ms=ENRICH_BATCH_MAX_WAIT_MS, max_queue=ENRICH_QUEUE_LIMIT)
+
 @app.get("/health")
 def health(): return {"status":"ok"}
 
 @app.post("/score")
-def score(md: MetadataIn):
-    rec = enrich_record(normalize_record(md.model_dump()))
-    result = score_record(rec)
+def score(md: MetadataIn, profile: Optional[str] = None):
+    # only bundled profiles by name: a file path would let clients make the server read its files
+    if profile is not None and profile not in available_profiles():
+        raise HTTPException(422, f"profile must be one of {available_profiles()}")
+    try:
+        plan = get_plan(profile)
+    except ProfileError as e:
+        raise HTTPException(422, str(e))
+    rec = normalize_record(md.model_dump())
+    # the cache saves enrich + score only; every request is still persisted under its own record_id
+    key = canonical_key(rec, plan.fingerprint) if score_cache else None
+    if key and (cached := score_cache.get(key)) is not None:
+        rec, result = {**cached["record"], "record_id": rec["record_id"]}, cached["result"]
+    else:
+        rec = enrich_record(rec)
+        result = score_record(rec, plan)
+        if key:
+            score_cache.set(key, {"record": rec, "result": result})
     write_reports(rec, result)
     return {"record": rec, "result": result}
+
+@app.get("/score/cache/stats")
+def score_cache_stats():
+    return score_cache.stats() if score_cache else {"backend": "off"}
+
+@app.delete("/score/cache")
+def score_cache_clear():
+    if score_cache:
+        score_cache.clear()
+    return {"cleared": bool(score_cache)}
+
+@app.post("/enrich/advanced")
+async def enrich_advanced(body: AdvancedIn):
+    try:
+        return await enrich_batcher.submit(body.model_dump())
+    except BatcherOverloaded as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "1"})
+
+@app.get("/enrich/advanced/metrics")
+def enrich_advanced_metrics(): return enrich_batcher.metrics()
+
+@app.get("/records")
+def list_records(q: Optional[str] = None,
+                 identifier: Optional[str] = None, license: Optional[str] = None,
+                 format: Optional[str] = None, publisher: Optional[str] = None,
+                 min_F: Optional[float] = None, min_A: Optional[float] = None,
+                 min_I: Optional[float] = None, min_R: Optional[float] = None,
+                 min_total: Optional[float] = None, max_total: Optional[float] = None,
+                 sort: str = "total", order: str = Query("desc", pattern="^(asc|desc)$"),
+                 limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0),
+                 include_deleted: bool = False):
+    if sort not in SORTABLE_COLUMNS:
+        raise HTTPException(422, f"sort must be one of {list(SORTABLE_COLUMNS)}")
+    where = {k: v for k, v in {"identifier": identifier, "license": license,
+                               "format": format, "publisher": publisher}.items() if v}
+    mins = {k: v for k, v in {"F": min_F, "A": min_A, "I": min_I, "R": min_R,
+                              "total": min_total}.items() if v is not None}
+    maxs = {"total": max_total} if max_total is not None else {}
+    page = get_catalogue().query(q=q, where=where, min_scores=mins, max_scores=maxs,
+                                 sort=sort, descending=order == "desc", limit=limit, offset=offset,
+                                 include_deleted=include_deleted)
+    return {**page, "limit": limit, "offset": offset}
+
+@app.get("/records/{record_id}")
+def get_record(record_id: str):
+    data = get_catalogue().get(record_id)
+    if data is None:
+        raise HTTPException(404, f"Unknown record_id: {record_id}")
+    return data
+
+@app.get("/records/{record_id}/markdown", response_class=PlainTextResponse)
+def get_record_markdown(record_id: str):
+    try:
+        return PlainTextResponse(render_markdown(record_id), media_type="text/markdown; charset=utf-8")
+    except FileNotFoundError:
+        raise HTTPException(404, f"Unknown record_id: {record_id}")
+
+@app.get("/records/{record_id}/history")
+def get_record_history(record_id: str):
+    events = get_history().trend(record_id)
+    if not events:
+        raise HTTPException(404, f"No score history for record_id: {record_id}")
+    return {"record_id": record_id, "events": events}
+
+@app.get("/records/{record_id}/duplicates")
+def get_record_duplicates(record_id: str):
+    return {"record_id": record_id,
+            "duplicates": [{"record_id": rid, "similarity": sim} for rid, sim in get_index().duplicates_of(record_id)]}
+
+@app.get("/duplicates")
+def duplicate_clusters(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+    clusters = get_index().clusters()
+    return {"total": len(clusters), "limit": limit, "offset": offset, "clusters": clusters[offset:offset + limit]}
+
+@app.get("/history/timeseries")
+def history_timeseries(bucket: str = Query("day", description=f"One of {', '.join(BUCKETS)}")):
+    if bucket not in BUCKETS:
+        raise HTTPException(422, f"Unknown bucket {bucket!r}; expected one of {list(BUCKETS)}")
+    return {"bucket": bucket, "series": get_history().timeseries(bucket)}
+
+@app.get("/stats/distribution")
+def score_distribution(start: Optional[str] = Query(None, description="First day (YYYY-MM-DD) of scoring events"),
+                       end: Optional[str] = Query(None, description="Last day (YYYY-MM-DD) of scoring events"),
+                       bins: int = Query(10, ge=1, le=100)):
+    """Percentiles and histograms of the live catalogue, or of events between ``start`` and ``end``."""
+    cat = get_catalogue()
+    sketch = cat.sketch_range(start, end) if start or end else cat.sketch()
+    return {"window": "current" if not (start or end) else {"start": start, "end": end},
+            "summary": sketch.summary(),
+            "histograms": {k: [{"lo": lo, "hi": hi, "count": c} for lo, hi, c in sketch.histogram(k, bins)]
+                           for k in sketch.counts}}
+
+@app.get("/search")
+def search(q: str = Query(..., min_length=1),
+           fields: Optional[str] = Query(None, description="Comma-separated subset of title,description,keywords,subjects"),
+           license: Optional[str] = None, format: Optional[str] = None,
+           publisher: Optional[str] = None, min_total: Optional[float] = None,
+           limit: int = Query(20, ge=1, le=200), offset: int = Query(0, ge=0)):
+    field_list = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    unknown = [f for f in field_list if f not in SEARCH_FIELDS]
+    if unknown:
+        raise HTTPException(422, f"Unknown search fields {unknown}; expected a subset of {list(SEARCH_FIELDS)}")
+    where = {k: v for k, v in {"license": license, "format": format, "publisher": publisher}.items() if v}
+    mins = {"total": min_total} if min_total is not None else {}
+    page = get_catalogue().search(q, fields=field_list, where=where, min_scores=mins,
+                                  limit=limit, offset=offset)
+    return {**page, "limit": limit, "offset": offset}
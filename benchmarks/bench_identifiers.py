@@ -0,0 +1,69 @@
+"""Identifier extraction: four whole-text ``findall`` passes vs the single-pass extractor.
+
+    python benchmarks/bench_identifiers.py --records 20000
+
+Texts are the title + description + keywords blobs ``enrich_record`` scans,
+built from the synthetic generator (multi-sentence descriptions where most
+records carry no identifier and the rest embed a DOI, e-mail, URL, handle or
+ORCID), plus hand-written edge cases. Every text's output is checked against
+the old passes (DOIs compared after the same normalisation) before timing.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+
+from fairmeta.identifiers import DOI_RX, EMAIL_RX, HANDLE_RX, URL_RX, extract, normalize_doi
+from synthetic import iter_records
+
+EDGE_CASES = [
+    "Cite as doi:10.5281/zenodo.12345. See (https://doi.org/10.1000/xyz(1)) too.",
+    "Mail a.b-c@uni.example.ac.uk or see https://x.org/a@b/c?d=1, hdl:11234/1-3105;",
+    "Years 1967/2014 and 2001-2020, ranges 0000-0002-1825-0097 ORCID.",
+    "Nothing to see here, just prose without any identifiers at all.",
+    "",
+]
+
+
+def old_extract(text):
+    return {"dois": [normalize_doi(d) for d in DOI_RX.findall(text)], "handles": HANDLE_RX.findall(text),
+            "urls": URL_RX.findall(text), "emails": EMAIL_RX.findall(text)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--records", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    texts = [" ".join([r["title"], r["description"], " ".join(r["keywords"])])
+             for r in iter_records(args.records)] + EDGE_CASES
+    for t in texts:
+        new = extract(t)
+        assert {k: new[k] for k in ("dois", "handles", "urls", "emails")} == old_extract(t), t
+
+    def best(fn, subset):
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            for t in subset:
+                fn(t)
+            times.append(time.perf_counter() - t0)
+        return len(subset) / min(times)
+
+    with_ids = [t for t in texts if any(extract(t).values())]
+    plain = [t for t in texts if not any(extract(t).values())]
+    print(f"{len(texts)} texts ({len(with_ids)} with identifiers); outputs identical")
+    print(f"{'texts/s':<22}{'findall x4':>12}{'single pass':>13}")
+    for label, subset in (("without identifiers", plain), ("with identifiers", with_ids), ("all", texts)):
+        old, new = best(old_extract, subset), best(extract, subset)
+        print(f"{label:<22}{old:12.0f}{new:13.0f}  ({new / old:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Link checker against a local HTTP stand-in server.
+
+    python benchmarks/bench_linkcheck.py --urls 400 --delay-ms 20 --per-host 8
+
+Starts a threaded ``http.server`` on 127.0.0.1 that serves a mix of links:
+``/ok`` (200), ``/nohead`` (405 to HEAD, 200 to GET), ``/gone`` (404),
+``/redirect`` (302 to ``/ok``) and ``/reset`` (drops the connection). Each
+response waits ``--delay-ms``. The server is reached as both ``127.0.0.1`` and
+``localhost`` so two per-host limits apply.
+
+Checks that every URL gets the expected verdict, that no host ever saw more
+than ``--per-host`` concurrent requests, and that a second pass is served
+entirely from the TTL cache; then reports throughput against a sequential
+``requests`` baseline over a sample.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from fairmeta.linkcheck import LinkCache, LinkChecker
+
+EXPECTED = {"ok": True, "nohead": True, "gone": False, "redirect": True, "reset": False}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    delay = 0.0
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _serve(self, head: bool):
+        host = self.headers.get("Host", "").split(":")[0]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            time.sleep(self.delay)
+            kind = self.path.strip("/").split("/")[0]
+            if kind == "reset":
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            status, headers = 200, {}
+            if kind == "nohead" and head:
+                status = 405
+            elif kind == "gone":
+                status = 404
+            elif kind == "redirect":
+                status, headers = 302, {"Location": "/ok" + self.path[len("/redirect"):]}
+            body = b"" if head else b"stand-in\n"
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(b"stand-in\n")))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.lock:
+                self.active[host] -= 1
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--urls", type=int, default=400)
+    ap.add_argument("--delay-ms", type=float, default=20.0)
+    ap.add_argument("--per-host", type=int, default=8)
+    ap.add_argument("--sequential-sample", type=int, default=40)
+    args = ap.parse_args()
+
+    StandIn.delay = args.delay_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    kinds = list(EXPECTED)
+    urls = [f"http://{('127.0.0.1', 'localhost')[i % 2]}:{port}/{kinds[i % len(kinds)]}/{i}"
+            for i in range(args.urls)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LinkCache(pathlib.Path(tmp) / "links.sqlite", ttl=3600)
+        checker = LinkChecker(per_host=args.per_host, concurrency=64, timeout=5, cache=cache)
+        t0 = time.perf_counter()
+        results = asyncio.run(checker.check_many(urls))
+        elapsed = time.perf_counter() - t0
+
+        wrong = [u for u in urls if results[u]["ok"] != EXPECTED[u.split("/")[3]]]
+        assert not wrong, f"unexpected verdicts: {wrong[:5]}"
+        assert max(StandIn.peak.values()) <= args.per_host, StandIn.peak
+        fetched_stats = dict(checker.stats)
+
+        again = LinkChecker(per_host=args.per_host, cache=cache)
+        asyncio.run(again.check_many(urls))
+        assert again.stats["fetched"] == 0 and again.stats["cached"] == len(urls), again.stats
+
+    import requests
+    sample = urls[:args.sequential_sample]
+    t0 = time.perf_counter()
+    with requests.Session() as s:
+        for u in sample:
+            try:
+                r = s.head(u, allow_redirects=True, timeout=5)
+                if r.status_code in (405, 404):
+                    s.get(u, allow_redirects=True, timeout=5)
+            except requests.RequestException:
+                pass
+    seq_rate = len(sample) / (time.perf_counter() - t0)
+    server.shutdown()
+
+    rate = len(urls) / elapsed
+    print(f"async:      {rate:8.1f} urls/s  ({len(urls)} urls, {elapsed:.2f}s) stats={fetched_stats}")
+    print(f"sequential: {seq_rate:8.1f} urls/s  ({len(sample)} url sample)  -> {rate / seq_rate:.1f}x")
+    print(f"peak concurrent requests per host: {StandIn.peak} (limit {args.per_host})")
+    print("second pass: all results from cache")
+
+
+if __name__ == "__main__":
+    main()
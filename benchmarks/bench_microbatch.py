@@ -0,0 +1,67 @@
+"""Throughput of advanced enrichment: per-request vs micro-batched.
+
+    python benchmarks/bench_microbatch.py --requests 400 --concurrency 64
+
+Simulates ``--concurrency`` concurrent API clients. The per-request mode runs
+``enrich_text_advanced`` once per request in the thread pool (what a plain
+endpoint would do); the batched mode goes through ``MicroBatcher`` with
+``enrich_text_advanced_batch``. Topic labels are computed for the whole batch
+at once and NER goes through ``nlp.pipe`` when spaCy is installed; sentiment
+stays per request.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+
+from fairmeta.advanced_nlp import enrich_text_advanced, enrich_text_advanced_batch
+from fairmeta.batching import MicroBatcher
+from synthetic import iter_records
+
+
+async def _drive(call, items, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with sem:
+            return await call(item)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(it) for it in items))
+    return len(items) / (time.perf_counter() - t0)
+
+
+async def main_async(args):
+    items = [{"title": r["title"], "description": r["description"]} for r in iter_records(args.requests)]
+    loop = asyncio.get_running_loop()
+
+    async def per_request(item):
+        return await loop.run_in_executor(None, lambda: enrich_text_advanced(**item))
+
+    batcher = MicroBatcher(enrich_text_advanced_batch, max_batch_size=args.batch_size,
+                           max_wait_ms=args.max_wait_ms, max_queue=args.requests)
+    single = await _drive(per_request, items, args.concurrency)
+    batched = await _drive(batcher.submit, items, args.concurrency)
+    print(f"per-request: {single:8.1f} req/s")
+    print(f"micro-batch: {batched:8.1f} req/s  ({batched / single:.2f}x)")
+    m = batcher.metrics()
+    print(f"batches={m['batches']} mean_batch_size={m['mean_batch_size']:.1f} "
+          f"mean_queue_wait_ms={m['mean_queue_wait_ms']:.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
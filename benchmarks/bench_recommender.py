@@ -0,0 +1,70 @@
+"""Recommender catalogue build: serial enrich + ``fit`` vs ``HybridRecommender.from_source``.
+
+    python benchmarks/bench_recommender.py --records 20000 --jobs 1 2 4 8
+    python benchmarks/bench_recommender.py --records 2000 --advanced
+
+Records stream from the synthetic generator (never materialised for
+``from_source``). Every ``--jobs`` setting must produce the same item matrix;
+the table shows records/s and the speed-up over ``n_jobs=1``. The serial
+baseline is the loop the Recommendation page used (normalise → enrich →
+optional advanced enrich per row, then TF-IDF ``fit``).
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+
+from fairmeta.advanced_nlp import enrich_text_advanced
+from fairmeta.enrich import enrich_record
+from fairmeta.ingest import normalize_record
+from fairmeta.recommendation import HybridRecommender
+from synthetic import iter_records
+
+
+def serial(n: int, advanced: bool) -> HybridRecommender:
+    records = []
+    for raw in iter_records(n):
+        rec = enrich_record(normalize_record(raw))
+        if advanced:
+            rec["advanced_enrichment"] = enrich_text_advanced(rec.get("title", ""), rec.get("description", ""))
+        records.append(rec)
+    return HybridRecommender(records).fit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--records", type=int, default=20000)
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--chunk-size", type=int, default=1000)
+    ap.add_argument("--advanced", action="store_true", help="Include NER/sentiment/topic enrichment")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    serial(args.records, args.advanced)
+    base = time.perf_counter() - t0
+    print(f"{args.records} records, advanced={args.advanced}")
+    print(f"{'build':<22}{'seconds':>9}{'records/s':>11}{'speed-up':>10}")
+    print(f"{'serial + fit':<22}{base:9.2f}{args.records / base:11.0f}{'':>10}")
+
+    reference, one = None, None
+    for n_jobs in args.jobs:
+        t0 = time.perf_counter()
+        hr = HybridRecommender.from_source(iter_records(args.records), n_jobs=n_jobs,
+                                           chunk_size=args.chunk_size, advanced=args.advanced)
+        took = time.perf_counter() - t0
+        if reference is None:
+            reference = hr.item_matrix
+        else:
+            assert (abs(hr.item_matrix - reference) > 1e-12).nnz == 0, f"n_jobs={n_jobs} differs"
+        one = one or took
+        print(f"{f'from_source n_jobs={n_jobs}':<22}{took:9.2f}{args.records / took:11.0f}{one / took:9.2f}x")
+    print("item matrices identical across n_jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare report serialisation formats on a synthetic corpus.
+
+    python benchmarks/bench_serialization.py --records 5000
+
+Reports bytes on disk (total and per report) and encode/decode throughput for
+each format in ``fairmeta.serialization.EXTENSIONS``, alongside the legacy
+``json.dumps(..., indent=2)`` layout. Formats whose optional package is missing
+are skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+
+from fairmeta.ingest import normalize_record
+from fairmeta.enrich import enrich_record
+from fairmeta.fair_scoring import score_record
+from fairmeta import serialization
+from synthetic import iter_records
+
+
+def build_corpus(n: int):
+    out = []
+    for raw in iter_records(n):
+        rec = enrich_record(normalize_record(raw))
+        out.append({"record": rec, "result": score_record(rec)})
+    return out
+
+
+def _legacy_dumps(obj):
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _legacy_loads(data):
+    return json.loads(data.decode("utf-8"))
+
+
+def bench(name, encode, decode, corpus):
+    t0 = time.perf_counter()
+    blobs = [encode(doc) for doc in corpus]
+    t1 = time.perf_counter()
+    for blob in blobs:
+        decode(blob)
+    t2 = time.perf_counter()
+    size = sum(len(b) for b in blobs)
+    n = len(corpus)
+    return {"format": name, "bytes": size, "bytes_per_report": size / n,
+            "encode_per_s": n / (t1 - t0), "decode_per_s": n / (t2 - t1)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--records", type=int, default=5000)
+    args = ap.parse_args()
+
+    corpus = build_corpus(args.records)
+    rows = [bench("legacy indent=2", _legacy_dumps, _legacy_loads, corpus)]
+    for fmt in serialization.EXTENSIONS:
+        try:
+            serialization.dumps(corpus[0], fmt)
+        except RuntimeError as exc:
+            print(f"skip {fmt}: {exc}")
+            continue
+        rows.append(bench(fmt, lambda o, f=fmt: serialization.dumps(o, f), serialization.loads, corpus))
+
+    base = rows[0]["bytes"]
+    print(f"{'format':<16}{'MB':>9}{'B/report':>10}{'vs legacy':>11}{'enc/s':>11}{'dec/s':>11}")
+    for r in rows:
+        print(f"{r['format']:<16}{r['bytes'] / 1e6:>9.2f}{r['bytes_per_report']:>10.0f}"
+              f"{r['bytes'] / base:>10.0%}{r['encode_per_s']:>11.0f}{r['decode_per_s']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Track import-time cost of the package entry points with ``python -X importtime``.
+
+    python benchmarks/bench_startup.py                    # print a table
+    python benchmarks/bench_startup.py --save startup.json
+    python benchmarks/bench_startup.py --compare startup.json
+
+Each target is imported in a fresh interpreter ``--runs`` times and the fastest
+run is kept. Besides the cumulative import time, the heaviest third-party
+top-level packages pulled in are listed, which is where regressions (an eager
+``import pandas`` or ``import spacy``) show up. ``--compare`` exits non-zero
+when a target got slower than the saved baseline by more than ``--tolerance``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+TARGETS = ["fairmeta.fair_scoring", "fairmeta.enrich", "fairmeta.report", "api.main"]
+WATCHED = ["spacy", "textblob", "sklearn", "pandas", "numpy", "rdflib", "jinja2", "yaml",
+           "requests", "zstandard", "msgpack", "fastapi", "pydantic"]
+
+
+def import_profile(module: str) -> Tuple[int, Dict[str, int]]:
+    """Return (cumulative µs for ``module``, {top-level package: cumulative µs})."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT / "src"), str(ROOT)]))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env, cwd=ROOT, check=True)
+    total, packages = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line.split("|")
+            us = int(cumulative.strip())
+        except ValueError:
+            continue  # header line
+        stripped = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if stripped == module and depth == 0:
+            total = us
+        top = stripped.split(".")[0]
+        if top in WATCHED and "." not in stripped:
+            packages[top] = max(packages.get(top, 0), us)
+    return total, packages
+
+
+def measure(targets: List[str], runs: int) -> Dict[str, Dict]:
+    out = {}
+    for module in targets:
+        samples = [import_profile(module) for _ in range(runs)]
+        best = min(samples, key=lambda s: s[0])
+        out[module] = {"us": best[0], "heavy": dict(sorted(best[1].items(), key=lambda kv: -kv[1]))}
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("targets", nargs="*", default=TARGETS)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--save", type=pathlib.Path)
+    ap.add_argument("--compare", type=pathlib.Path)
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (fraction)")
+    args = ap.parse_args()
+
+    results = measure(args.targets, args.runs)
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    failed = False
+    print(f"{'module':<24}{'ms':>9}{'baseline':>10}  heavy imports (ms)")
+    for module, r in results.items():
+        base = baseline.get(module, {}).get("us")
+        heavy = ", ".join(f"{k} {v / 1000:.0f}" for k, v in r["heavy"].items()) or "-"
+        base_s = f"{base / 1000:.1f}" if base else "-"
+        print(f"{module:<24}{r['us'] / 1000:>9.1f}{base_s:>10}  {heavy}")
+        if base and r["us"] > base * (1 + args.tolerance):
+            failed = True
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+    if failed:
+        print("Import time regressed beyond tolerance.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
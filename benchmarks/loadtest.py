@@ -0,0 +1,311 @@
+"""Load-test the API service locally: uvicorn with N workers, async httpx clients.
+
+    python benchmarks/loadtest.py --workers 4 --concurrency 64 --duration 30
+    python benchmarks/loadtest.py --mix score=6,score_repeat=2,search=1 --save load.json
+    python benchmarks/loadtest.py --compare load.json --tolerance 0.2
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000   # an already running server
+
+The app is started as ``uvicorn api.main:app --workers N`` on a free port,
+with the report and data directories in a temporary directory so the run
+never touches ``reports/``. ``--concurrency`` clients share one
+``httpx.AsyncClient`` and each picks its next operation from the weighted
+``--mix``:
+
+- ``score``: ``POST /score`` with a fresh synthetic record (cache miss, enrich,
+  score, catalogue/history/sketch/dedup writes);
+- ``score_repeat``: ``POST /score`` from a small pool (score-cache hits);
+- ``search``: ``GET /search`` for a subject term (FTS5);
+- ``records``: ``GET /records`` sorted by total score;
+- ``record``: ``GET /records/{id}`` for ids scored earlier in the run;
+- ``stats``: ``GET /stats/distribution``;
+- ``enrich``: ``POST /enrich/advanced`` (micro-batched NLP).
+
+The API makes no outbound calls itself; the harvesters do. ``--harvest``
+runs incremental CKAN and Zenodo harvests into the same catalogue while the
+load is on, against the stand-in servers in ``standins.py`` (so catalogue
+writes from the harvester contend with the API's, as in production). With
+``--url`` the harvests need the target server's ``--reports-dir`` and
+``--data-dir``, since only those locate its catalogue.
+
+Per operation and overall the report has request count, errors, throughput
+and p50/p95/p99/mean latency. ``--save`` writes it as JSON; ``--compare``
+prints the change against a saved report and exits non-zero when throughput
+dropped, or p95 latency rose, by more than ``--tolerance``, or the error rate
+rose by more than ``--error-tolerance`` (absolute).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+
+import httpx
+
+from standins import HarvesterStandIn
+from synthetic import make_record, make_records
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_MIX = "score=4,score_repeat=2,search=2,records=1,record=1,stats=1"
+SUBJECTS = ["climate", "genome", "traffic", "air quality", "groundwater", "census", "ocean",
+            "biodiversity", "energy", "soil"]
+
+
+class Workload:
+    """Generates requests for each operation and remembers ids to fetch later."""
+
+    def __init__(self, seed: int, pool_size: int = 50):
+        self.rng = random.Random(seed)
+        self.pool = make_records(pool_size, seed + 1)
+        self.ids: List[str] = []
+        self._n = 0
+
+    async def score(self, client: httpx.AsyncClient) -> httpx.Response:
+        self._n += 1
+        r = await client.post("/score", json=make_record(self.rng, 10_000_000 + self._n))
+        self._learn(r)
+        return r
+
+    async def score_repeat(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post("/score", json=self.rng.choice(self.pool))
+
+    async def search(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/search", params={"q": self.rng.choice(SUBJECTS), "limit": 20})
+
+    async def records(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/records", params={"sort": "total", "limit": 20,
+                                                    "offset": self.rng.randrange(0, 200, 20)})
+
+    async def record(self, client: httpx.AsyncClient) -> httpx.Response:
+        if not self.ids:
+            return await self.score(client)
+        return await client.get(f"/records/{self.rng.choice(self.ids)}")
+
+    async def stats(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/stats/distribution")
+
+    async def enrich(self, client: httpx.AsyncClient) -> httpx.Response:
+        rec = self.rng.choice(self.pool)
+        return await client.post("/enrich/advanced", json={"title": rec["title"], "description": rec["description"]})
+
+    def _learn(self, r: httpx.Response) -> None:
+        if r.status_code == 200 and len(self.ids) < 5000:
+            rid = r.json().get("record", {}).get("record_id")
+            if rid:
+                self.ids.append(rid)
+
+
+OPS = [name for name in vars(Workload) if not name.startswith("_")]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPS:
+            raise SystemExit(f"unknown operation {name!r}; expected one of {OPS}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_ms: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, int(round(q / 100 * len(sorted_ms) + 0.5)) - 1))
+    return sorted_ms[k]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    ms = sorted(latencies)
+    return {"requests": len(ms), "errors": errors, "rps": len(ms) / elapsed if elapsed else 0.0,
+            "p50": percentile(ms, 50), "p95": percentile(ms, 95), "p99": percentile(ms, 99),
+            "mean": sum(ms) / len(ms) if ms else 0.0}
+
+
+async def drive(url: str, mix: Dict[str, float], concurrency: int, requests: Optional[int],
+                duration: Optional[float], warmup: int, seed: int, timeout: float) -> Dict:
+    work = Workload(seed)
+    names, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    lat: Dict[str, List[float]] = {n: [] for n in names}
+    errs: Dict[str, int] = {n: 0 for n in names}
+
+    async def phase(client: httpx.AsyncClient, requests: Optional[int], deadline: Optional[float],
+                    measure: bool) -> float:
+        issued = 0
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal issued
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                if requests is not None:
+                    if issued >= requests:
+                        return
+                    issued += 1
+                op = rng.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    r = await getattr(work, op)(client)
+                    ok = r.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if measure:
+                    lat[op].append((time.perf_counter() - t0) * 1000)
+                    errs[op] += not ok
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(seed * 1000 + i)) for i in range(concurrency)))
+        return time.perf_counter() - started
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        # unmeasured pass over the same mix on every connection: warms each worker, seeds the catalogue
+        await phase(client, warmup, None, measure=False)
+        deadline = time.perf_counter() + duration if duration else None
+        elapsed = await phase(client, requests, deadline, measure=True)
+    ops = {n: summarize(lat[n], errs[n], elapsed) for n in names if lat[n]}
+    overall = summarize([v for n in names for v in lat[n]], sum(errs.values()), elapsed)
+    return {"elapsed": elapsed, "overall": overall, "ops": ops}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, env: Dict[str, str], startup_timeout: float = 60.0):
+    """Launch uvicorn and wait for ``/health``; returns (process, base url)."""
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1",
+                             "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+                            cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("uvicorn did not become healthy in time")
+
+
+def start_harvests(env: Dict[str, str], standin: HarvesterStandIn) -> List[subprocess.Popen]:
+    delta = [sys.executable, "-m", "fairmeta.harvesters.delta"]
+    quiet = dict(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT, env=env)
+    return [subprocess.Popen(delta + ["ckan", f"{standin.url}/ckan", "--reset"], **quiet),
+            subprocess.Popen(delta + ["zenodo", "--reset"], **quiet)]
+
+
+def error_rate(row: Dict[str, float]) -> float:
+    return row["errors"] / row["requests"] if row["requests"] else 0.0
+
+
+def print_report(report: Dict, baseline: Dict) -> bool:
+    """Print the table (with deltas against ``baseline``); True if any row is worse than tolerance."""
+    tol, err_tol = report["tolerance"], report["error_tolerance"]
+    failed = False
+    print(f"{'operation':<14}{'reqs':>7}{'errs':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'mean ms':>9}{'Δ req/s':>10}{'Δ p95':>9}{'Δ err%':>9}")
+    rows = list(report["ops"].items()) + [("overall", report["overall"])]
+    for name, r in rows:
+        base = baseline.get("overall") if name == "overall" else baseline.get("ops", {}).get(name)
+        d_rps = d_p95 = d_err = "-"
+        if base and base["requests"]:
+            err_change = error_rate(r) - error_rate(base)
+            d_err = f"{err_change * 100:+.1f}"
+            failed |= err_change > err_tol
+        if base and base["rps"] and base["p95"]:
+            rps_change, p95_change = r["rps"] / base["rps"] - 1, r["p95"] / base["p95"] - 1
+            d_rps, d_p95 = f"{rps_change:+.0%}", f"{p95_change:+.0%}"
+            failed |= rps_change < -tol or p95_change > tol
+        print(f"{name:<14}{r['requests']:>7}{r['errors']:>6}{r['rps']:>9.1f}{r['p50']:>9.1f}"
+              f"{r['p95']:>9.1f}{r['p99']:>9.1f}{r['mean']:>9.1f}{d_rps:>10}{d_p95:>9}{d_err:>9}")
+    return failed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", help="Target a running server instead of starting one")
+    ap.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    ap.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    ap.add_argument("--requests", type=int, help="Total requests (default: run for --duration)")
+    ap.add_argument("--duration", type=float, default=20.0, help="Seconds to run when --requests is not set")
+    ap.add_argument("--warmup", type=int, default=200, help="Unmeasured requests sent before measuring")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted operations, any of {', '.join(OPS)}")
+    ap.add_argument("--harvest", action="store_true", help="Run stand-in CKAN/Zenodo harvests during the load")
+    ap.add_argument("--harvest-records", type=int, default=500)
+    ap.add_argument("--reports-dir", type=pathlib.Path,
+                    help="FAIRMETA_REPORTS_DIR for the server and harvests (default: a temporary directory)")
+    ap.add_argument("--data-dir", type=pathlib.Path,
+                    help="FAIRMETA_DATA_DIR for the server and harvests (default: a temporary directory)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--save", type=pathlib.Path)
+    ap.add_argument("--compare", type=pathlib.Path)
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="Allowed throughput drop / p95 rise vs baseline (fraction)")
+    ap.add_argument("--error-tolerance", type=float, default=0.01,
+                    help="Allowed error-rate rise vs baseline (absolute fraction of requests)")
+    args = ap.parse_args()
+    if args.url and args.harvest and not (args.reports_dir and args.data_dir):
+        ap.error("--harvest with --url needs the target server's --reports-dir and --data-dir, "
+                 "or the harvests would write to a different catalogue")
+    mix = parse_mix(args.mix)
+
+    with ExitStack() as stack:
+        url, harvests = args.url, []
+        if not url or args.harvest:
+            tmp = pathlib.Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="fairmeta-load-")))
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT / "src"), str(ROOT)]),
+                       FAIRMETA_REPORTS_DIR=str(args.reports_dir or tmp / "reports"),
+                       FAIRMETA_DATA_DIR=str(args.data_dir or tmp / "data"))
+        if args.harvest:
+            standin = stack.enter_context(HarvesterStandIn(args.harvest_records, args.seed))
+            env.update(standin.env())
+        if not url:
+            proc, url = start_server(args.workers, env)
+            stack.callback(proc.wait)
+            stack.callback(proc.terminate)
+        if args.harvest:
+            harvests = start_harvests(env, standin)
+            for p in harvests:
+                stack.callback(p.kill)
+        result = asyncio.run(drive(url, mix, args.concurrency, args.requests,
+                                   None if args.requests else args.duration, args.warmup, args.seed, args.timeout))
+        harvest_status = [p.poll() for p in harvests]
+
+    report = {"workers": None if args.url else args.workers, "concurrency": args.concurrency, "mix": mix,
+              "tolerance": args.tolerance, "error_tolerance": args.error_tolerance, **result}
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    print(f"{result['overall']['requests']} requests in {result['elapsed']:.1f}s against {url} "
+          f"(workers={report['workers'] or '?'}, concurrency={args.concurrency})")
+    if harvests:
+        print("harvests: " + ", ".join("running" if s is None else f"exit {s}" for s in harvest_status))
+    failed = print_report(report, baseline)
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2))
+    if failed:
+        print("Throughput, p95 latency or error rate regressed beyond tolerance.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Local stand-ins for the services the harvesters call.
+
+:class:`HarvesterStandIn` serves synthetic records in the shapes the
+harvesters expect, so harvests run without network access:
+
+- Zenodo REST (``/api/records`` and ``/api/records/<id>``) and OAI-PMH
+  (``/oai2d``, ``ListIdentifiers`` with a few deleted headers);
+- CKAN action API (``/api/3/action/package_search``, ``package_list``,
+  ``package_show``) under ``/ckan``;
+- ``/files/...`` answers 200 to HEAD and GET, so link checks resolve locally.
+
+Point the harvesters at it with ``FAIRMETA_ZENODO_API``/``FAIRMETA_ZENODO_OAI``
+(see :meth:`HarvesterStandIn.env`) and ``<url>/ckan`` as the CKAN base URL.
+"""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+
+from synthetic import make_records
+
+
+class HarvesterStandIn:
+    def __init__(self, n_records: int = 500, seed: int = 7):
+        self.records = make_records(n_records, seed)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "HarvesterStandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def env(self) -> Dict[str, str]:
+        return {"FAIRMETA_ZENODO_API": f"{self.url}/api/records", "FAIRMETA_ZENODO_OAI": f"{self.url}/oai2d"}
+
+    # --- payloads -------------------------------------------------------------
+    def _zenodo(self, i: int) -> Dict[str, Any]:
+        r = self.records[i]
+        return {
+            "id": i + 1, "doi": f"10.5072/standin.{i + 1}", "updated": r["modified"],
+            "links": {"html": f"{self.url}/files/record/{i + 1}"},
+            "files": [{"key": f"data.{(r['format'] or 'csv').lower()}",
+                       "links": {"self": f"{self.url}/files/{i + 1}/data"}}],
+            "metadata": {"title": r["title"], "description": r["description"], "keywords": r["keywords"],
+                         "creators": [{"name": c["name"]} for c in r["creators"]],
+                         "license": {"id": r["license"]}, "version": r["version"],
+                         "publication_date": r["issued"]},
+        }
+
+    def _ckan(self, i: int) -> Dict[str, Any]:
+        r = self.records[i]
+        return {
+            "id": f"standin-{i}", "name": f"dataset-{i}", "title": r["title"], "notes": r["description"],
+            "tags": [{"name": k} for k in r["keywords"]], "author": r["creators"][0]["name"],
+            "author_email": r["creators"][0]["email"], "license_id": r["license"],
+            "metadata_created": r["issued"], "metadata_modified": r["modified"], "version": r["version"],
+            "resources": [{"url": f"{self.url}/files/{i}/data", "format": r["format"]}],
+            "organization": {"title": r["publisher"]} if r["publisher"] else None,
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str = "application/json") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _json(self, obj: Any) -> None:
+                self._send(200, json.dumps(obj).encode("utf-8"))
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                q = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                path, n = parts.path.rstrip("/"), len(standin.records)
+                if path.startswith("/files/"):
+                    return self._send(200, b"stand-in\n", "text/plain")
+                if path == "/api/records":
+                    size, page = int(q.get("size", 100)), int(q.get("page", 1))
+                    lo = (page - 1) * size
+                    hits = [standin._zenodo(i) for i in range(lo, min(lo + size, n))]
+                    links = {"next": f"{standin.url}/api/records?page={page + 1}"} if lo + size < n else {}
+                    return self._json({"hits": {"hits": hits, "total": n}, "links": links})
+                if path.startswith("/api/records/"):
+                    i = int(path.rsplit("/", 1)[-1]) - 1
+                    return self._json(standin._zenodo(i)) if 0 <= i < n else self._send(404, b"{}")
+                if path == "/oai2d":
+                    headers = "".join(
+                        f'<header status="deleted"><identifier>oai:zenodo.org:{i}</identifier></header>'
+                        for i in (n + 1, n + 2))
+                    xml = ('<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><ListIdentifiers>'
+                           f"{headers}</ListIdentifiers></OAI-PMH>")
+                    return self._send(200, xml.encode("utf-8"), "text/xml")
+                if path.startswith("/ckan/api/3/action/"):
+                    action = path.rsplit("/", 1)[-1]
+                    if action == "package_search":
+                        # honours the harvester's fq=metadata_modified:[ts TO *] and its sort order
+                        start, rows = int(q.get("start", 0)), int(q.get("rows", 500))
+                        since = q.get("fq", "").partition("[")[2].partition(" TO")[0].rstrip("Z")
+                        pkgs = sorted((standin._ckan(i) for i in range(n)),
+                                      key=lambda p: (p["metadata_modified"], p["id"]))
+                        pkgs = [p for p in pkgs if p["metadata_modified"] >= since]
+                        result: Any = {"count": len(pkgs), "results": pkgs[start:start + rows]}
+                    elif action == "package_list":
+                        result = [f"dataset-{i}" for i in range(n)]
+                    elif action == "package_show":
+                        result = standin._ckan(int(q.get("id", "dataset-0").rsplit("-", 1)[-1]))
+                    else:
+                        return self._json({"success": False, "error": f"unknown action {action}"})
+                    return self._json({"success": True, "result": result})
+                self._send(404, b"{}")
+
+        return Handler
+
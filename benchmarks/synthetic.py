@@ -0,0 +1,76 @@
+"""Synthetic metadata generator for benchmarks and load tests.
+
+Records follow the raw shapes the harvesters see (CKAN/Zenodo/CSV fields) with
+realistic lengths and a realistic mix of identifiers, licences and formats, so
+benchmark numbers reflect what the pipeline does on real catalogues. Output is
+deterministic for a given seed.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List
+import random
+
+_SUBJECTS = [
+    "climate", "temperature", "precipitation", "genome", "rna-seq", "bicycle traffic",
+    "air quality", "groundwater", "land cover", "lunar radar", "ocean salinity",
+    "machine learning", "neural network", "census", "public transport", "soil moisture",
+    "biodiversity", "coordinates", "geotiff", "ontology", "schema.org", "energy demand",
+]
+_FILLER = (
+    "This dataset provides {a} observations collected across {n} stations between "
+    "{y0} and {y1}. Values were quality controlled and aggregated to {res} resolution. "
+    "The collection supports research on {b} and {c} and is updated {freq}. "
+)
+_EXTRAS = [
+    "See DOI:10.{p}/zenodo.{n} for the accompanying paper.",
+    "Contact the maintainers at data-team{n}@example.org for access questions.",
+    "Documentation is available at https://example.org/docs/{n}.",
+    "Related handle: hdl:{p}/{n}.",
+    "Principal investigator ORCID: https://orcid.org/0000-0002-{p}-{n4}.",
+    "",
+    "",
+    "",
+]
+_LICENSES = ["CC-BY-4.0", "CC0", "ODC-BY", "MIT", "", "Proprietary", "notspecified", "CC-BY-NC"]
+_FORMATS = ["CSV", "JSON", "XLSX", "PDF", "NETCDF", "GEOJSON", "ZIP", ""]
+_PUBLISHERS = ["Open Science Lab", "Dublin City Council", "Zenodo", "EU Open Data", ""]
+
+
+def make_record(rng: random.Random, i: int) -> Dict[str, Any]:
+    """Return one raw metadata dict (before ``normalize_record``)."""
+    a, b, c = rng.sample(_SUBJECTS, 3)
+    desc = _FILLER.format(a=a, b=b, c=c, n=rng.randint(3, 900), y0=rng.randint(1950, 2010),
+                          y1=rng.randint(2011, 2025), res=rng.choice(["hourly", "daily", "1 km"]),
+                          freq=rng.choice(["monthly", "yearly", "irregularly"]))
+    desc *= rng.randint(1, 3)
+    desc += rng.choice(_EXTRAS).format(p=rng.randint(1000, 99999), n=rng.randint(1, 9999999),
+                                       n4=f"{rng.randint(0, 9999):04d}")
+    ident = rng.choice([f"10.{rng.randint(1000, 9999)}/zenodo.{i}", f"hdl:{rng.randint(1000, 99999)}/{i}",
+                        f"https://example.org/dataset/{i}", f"{i:08x}-2e1c-4b72-8fbd-cb9f9cbbc118", ""])
+    return {
+        "title": f"{a.title()} and {b} dataset {i}",
+        "description": desc.strip(),
+        "keywords": rng.sample(_SUBJECTS, rng.randint(0, 5)),
+        "creators": [{"name": f"Author {rng.randint(1, 5000)}",
+                      "email": rng.choice(["", f"author{i}@example.org"])}],
+        "landing_page": rng.choice(["", f"https://example.org/dataset/{i}"]),
+        "access_url": rng.choice(["", f"https://example.org/dataset/{i}/data.csv"]),
+        "identifier": ident,
+        "license": rng.choice(_LICENSES),
+        "format": rng.choice(_FORMATS),
+        "provenance": rng.choice(["", "Compiled from station logs; QC removed outliers; resampled daily."]),
+        "version": rng.choice(["", "1.0.0", "2.3"]),
+        "publisher": rng.choice(_PUBLISHERS),
+        "issued": f"20{rng.randint(10, 25)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "modified": f"2025-0{rng.randint(1, 9)}-2{rng.randint(0, 8)}T10:00:00",
+    }
+
+
+def iter_records(n: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        yield make_record(rng, i)
+
+
+def make_records(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    return list(iter_records(n, seed))
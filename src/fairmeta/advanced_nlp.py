@@ -4,54 +4,69 @@ These functions are *additive* and do not change the behaviour of the existing
 `enrich_record` pipeline. They can be used from the UI or other modules to
 perform deeper analysis such as NER, sentiment, and simple topic modelling.
 
-The design is defensive: if heavy NLP libraries or models are not installed,
-the functions degrade gracefully and return partial results instead of raising
-hard errors. This makes the project easier to run in constrained environments
+The design is defensive: heavy NLP libraries are imported on first use, and
+if they or their models are not installed the functions degrade gracefully and
+return partial results instead of raising hard errors. This makes the project easier to run in constrained environments
 while still aligning with the dissertation specification.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Union
 import logging
 
+from .text_features import TextFeatures, features
+
 logger = logging.getLogger(__name__)
 
-# --- Optional imports -------------------------------------------------------
-try:
-    import spacy  # type: ignore
+# --- Optional dependencies, loaded on first use ------------------------------
+# spaCy, TextBlob and scikit-learn take seconds to import; callers that only
+# need basic enrichment or scoring should not pay for them.
+@lru_cache(maxsize=None)
+def _get_nlp():
+    try:
+        import spacy  # type: ignore
+    except Exception:
+        logger.info("spaCy not installed; NER will be skipped.")
+        return None
     try:
-        _NLP = spacy.load("en_core_web_sm")
+        return spacy.load("en_core_web_sm")
     except Exception:  # model not downloaded yet
-        _NLP = None
         logger.warning("spaCy model 'en_core_web_sm' is not available. "
                        "Run: python -m spacy download en_core_web_sm")
-except Exception:
-    spacy = None  # type: ignore
-    _NLP = None   # type: ignore
-    logger.info("spaCy not installed; NER will be skipped.")
-
-try:
-    from textblob import TextBlob  # type: ignore
-except Exception:
-    TextBlob = None  # type: ignore
-    logger.info("TextBlob not installed; sentiment will be rule-based only.")
-
-try:
-    from sklearn.feature_extraction.text import CountVectorizer  # type: ignore
-    from sklearn.decomposition import LatentDirichletAllocation  # type: ignore
-except Exception:
-    CountVectorizer = None  # type: ignore
-    LatentDirichletAllocation = None  # type: ignore
-    logger.info("scikit-learn not fully available; topic modelling disabled.")
-
-
-def _simple_sentiment(text: str) -> float:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_textblob():
+    try:
+        from textblob import TextBlob  # type: ignore
+        return TextBlob
+    except Exception:
+        logger.info("TextBlob not installed; sentiment will be rule-based only.")
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_lda():
+    try:
+        from sklearn.feature_extraction.text import CountVectorizer  # type: ignore
+        from sklearn.decomposition import LatentDirichletAllocation  # type: ignore
+        return CountVectorizer, LatentDirichletAllocation
+    except Exception:
+        logger.info("scikit-learn not fully available; topic modelling disabled.")
+        return None, None
+
+
+def _simple_sentiment(text: str, tokens: Optional[Sequence[str]] = None) -> float:
     """Return sentiment polarity in [-1, 1].
 
     Uses TextBlob when available; otherwise falls back to a trivial lexicon-based
     count of positive vs negative words so the function always returns a value.
+    ``tokens`` may pass pre-computed :attr:`TextFeatures.tokens` for ``text``.
     """
     text = text or ""
+    TextBlob = _get_textblob()
     if TextBlob is not None:
         try:
             return float(TextBlob(text).sentiment.polarity)
@@ -60,7 +75,7 @@ def _simple_sentiment(text: str) -> float:
 
     positive = {"good", "great", "excellent", "positive", "useful", "helpful", "robust"}
     negative = {"bad", "poor", "negative", "buggy", "broken", "biased"}
-    tokens = {t.strip(".,;:!?()").lower() for t in text.split()}
+    tokens = set(tokens if tokens is not None else features(text).tokens)
     score = sum(1 for t in tokens if t in positive) - sum(1 for t in tokens if t in negative)
     if not tokens:
         return 0.0
@@ -74,10 +89,11 @@ def _extract_entities(text: str) -> List[Dict[str, Any]]:
     Returns a list of {text, label} dictionaries.
     """
     text = text or ""
-    if not text.strip() or _NLP is None:
+    nlp = _get_nlp() if text.strip() else None
+    if nlp is None:
         return []
     try:
-        doc = _NLP(text)
+        doc = nlp(text)
     except Exception as exc:  # pragma: no cover - very environment specific
         logger.warning("spaCy NER failed: %s", exc)
         return []
@@ -87,21 +103,44 @@ def _extract_entities(text: str) -> List[Dict[str, Any]]:
     return ents
 
 
-def _topic_labels(texts: List[str], n_topics: int = 3, n_words: int = 5) -> List[str]:
+def _extract_entities_batch(texts: List[str], batch_size: int = 64) -> List[List[Dict[str, Any]]]:
+    """Batched variant of :func:`_extract_entities` using ``nlp.pipe``.
+
+    Running spaCy over many documents at once amortises per-call overhead;
+    results are identical to calling ``_extract_entities`` per text.
+    """
+    out: List[List[Dict[str, Any]]] = [[] for _ in texts]
+    nlp = _get_nlp()
+    if nlp is None:
+        return out
+    idx = [i for i, t in enumerate(texts) if (t or "").strip()]
+    try:
+        for i, doc in zip(idx, nlp.pipe([texts[i] for i in idx], batch_size=batch_size)):
+            out[i] = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
+    except Exception as exc:  # pragma: no cover - very environment specific
+        logger.warning("spaCy batch NER failed: %s", exc)
+        return [_extract_entities(t) for t in texts]
+    return out
+
+
+def _topic_labels(texts: List[Union[str, TextFeatures]], n_topics: int = 3, n_words: int = 5) -> List[str]:
     """Very small LDA topic modeller over a tiny corpus.
 
     This is mainly illustrative and intended for small demo corpora derived
-    from a handful of records or a single user query.
+    from a handful of records or a single user query. ``texts`` may be strings
+    or :class:`TextFeatures`, whose cached ``terms`` are used as-is.
     """
+    CountVectorizer, LatentDirichletAllocation = _get_lda()
     if CountVectorizer is None or LatentDirichletAllocation is None:
         return []
 
-    docs = [t for t in texts if t]
+    docs = [t if isinstance(t, TextFeatures) else features(t) for t in texts if t]
+    docs = [d.terms for d in docs if d.text]
     if len(docs) < 1:
         return []
 
     try:
-        vectorizer = CountVectorizer(max_features=1000, stop_words="english")
+        vectorizer = CountVectorizer(max_features=1000, analyzer=list)
         X = vectorizer.fit_transform(docs)
         lda = LatentDirichletAllocation(
             n_components=min(n_topics, max(1, len(docs))),
@@ -124,6 +163,70 @@ def _topic_labels(texts: List[str], n_topics: int = 3, n_words: int = 5) -> List
         return []
 
 
+@lru_cache(maxsize=None)
+def _single_topic_model():
+    """Constants of the one-document LDA fit that :func:`_topic_labels` runs per record.
+
+    With a single document the model has one topic, so every word is assigned
+    to it and each online update moves the topic-word weights towards
+    ``topic_word_prior + count``. After ``max_iter`` updates they are
+    ``keep * init + (1 - keep) * (1 + count)``, where ``init`` is the
+    ``random_state=42`` gamma draw and ``keep`` the product of the ``1 - rho``
+    step sizes. Returns ``(init, keep)``, or ``None`` if scikit-learn is
+    missing or no longer fits that way (checked against a real fit).
+    """
+    CountVectorizer, LatentDirichletAllocation = _get_lda()
+    if CountVectorizer is None or LatentDirichletAllocation is None:
+        return None
+    import numpy as np
+
+    lda = LatentDirichletAllocation()
+    keep = float(np.prod([1 - (lda.learning_offset + t) ** -lda.learning_decay
+                          for t in range(1, lda.max_iter + 1)]))
+    init = np.random.RandomState(42).gamma(100.0, 0.01, 1000)
+    probe = features("Hourly precipitation and temperature observations",
+                     "Quality controlled hourly precipitation from weather stations; temperature in kelvin.")
+    model = (init, keep)
+    if _topic_labels_batch([probe], model) != [_topic_labels([probe])]:
+        logger.info("scikit-learn LDA changed; batched topic labels fall back to per-record fits.")
+        return None
+    return model
+
+
+def _topic_labels_batch(feats: List[TextFeatures], model=None, n_words: int = 5) -> List[List[str]]:
+    """Per-record :func:`_topic_labels` for a whole batch without fitting LDA per record.
+
+    Counts every record's terms with one ``CountVectorizer`` and ranks each
+    row by the closed-form topic weights of :func:`_single_topic_model`; the
+    labels equal ``[_topic_labels([f]) for f in feats]``.
+    """
+    model = model or _single_topic_model()
+    if model is None:
+        return [_topic_labels([f]) for f in feats]
+    import numpy as np
+
+    init, keep = model
+    CountVectorizer, _ = _get_lda()
+    out: List[List[str]] = [[] for _ in feats]
+    idx = [i for i, f in enumerate(feats) if f.text and f.terms]
+    if not idx:
+        return out
+    vectorizer = CountVectorizer(analyzer=list)
+    X = vectorizer.fit_transform([feats[i].terms for i in idx]).tocsr()
+    X.sort_indices()  # columns are in vocabulary (alphabetical) order, as in a per-record fit
+    words = vectorizer.get_feature_names_out()
+    for row, i in enumerate(idx):
+        cols = X.indices[X.indptr[row]:X.indptr[row + 1]]
+        counts = X.data[X.indptr[row]:X.indptr[row + 1]]
+        if len(cols) > len(init):  # CountVectorizer(max_features=1000) keeps the most frequent
+            kept = np.sort((-counts).argsort()[:len(init)])
+            cols, counts = cols[kept], counts[kept]
+        weights = keep * init[:len(cols)] + (1 - keep) * (1.0 + counts)
+        top = weights.argsort()[::-1][:n_words]
+        out[i] = ["Topic 1: " + ", ".join(words[cols[j]] for j in top)]
+    return out
+
+
 def enrich_text_advanced(title: str = "", description: str = "") -> Dict[str, Any]:
     """High-level enrichment wrapper used by the UI and API.
 
@@ -139,13 +242,30 @@ def enrich_text_advanced(title: str = "", description: str = "") -> Dict[str, An
         - entities: list of {text,label}
         - topics: list of topic label strings
     """
-    combined = "\n\n".join([t for t in [title or "", description or ""] if t])
-    sentiment = _simple_sentiment(combined)
-    entities = _extract_entities(combined)
-    topics = _topic_labels([combined])
+    feats = features(title, description)
+    sentiment = _simple_sentiment(feats.text, feats.tokens)
+    entities = _extract_entities(feats.text)
+    topics = _topic_labels([feats])
 
     return {
         "sentiment": sentiment,
         "entities": entities,
         "topics": topics,
     }
+
+
+def enrich_text_advanced_batch(items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Batched :func:`enrich_text_advanced` over ``{title, description}`` dicts.
+
+    NER runs once over the whole batch (``nlp.pipe``) and topics come from
+    :func:`_topic_labels_batch`; results equal the single-item call per
+    document. Sentiment stays per document: TextBlob has no batch API and the
+    fallback lexicon is a set lookup.
+    """
+    feats = [features(it.get("title"), it.get("description")) for it in items]
+    entities = _extract_entities_batch([f.text for f in feats])
+    topics = _topic_labels_batch(feats)
+    return [
+        {"sentiment": _simple_sentiment(f.text, f.tokens), "entities": ents, "topics": tops}
+        for f, ents, tops in zip(feats, entities, topics)
+    ]
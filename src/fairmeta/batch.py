@@ -0,0 +1,242 @@
+"""Partitioned batch scoring with a deterministic merge.
+
+A run splits its input by a hash of ``record_id`` into N partitions. Each
+partition is processed independently, either by local worker processes
+(:func:`run_local`) or by separate invocations on different nodes that share
+only a filesystem (``python -m fairmeta.batch partition --index K ...``). Every
+partition reads the whole input, keeps the records that hash to it and writes:
+
+* ``part-KKKKK.jsonl.gz`` — a report segment, one ``{"record", "result"}``
+  object per line, sorted by ``record_id``;
+* ``part-KKKKK.stats.json`` — a partial summary (counts, score sums and a
+  :class:`~fairmeta.stats_utils.ScoreSketch`). It is written last and doubles
+  as the partition's completion marker.
+
+:func:`merge` then combines the segments, in partition order, into the report
+store and the catalogue, and folds the partials into one ``summary.json``. For
+a given input and partition count the result is byte-for-byte reproducible.
+
+Usage::
+
+    python -m fairmeta.batch run --input data/catalogue.csv --out runs/nightly --partitions 8
+    python -m fairmeta.batch partition --input ... --out ... --partitions 8 --index 3
+    python -m fairmeta.batch merge --out runs/nightly --partitions 8
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import uuid
+
+from .ingest import normalize_record
+from .enrich import enrich_record
+from .fair_scoring import score_record
+from .report import write_reports_many
+from .stats_utils import SCORE_KEYS, ScoreSketch
+
+logger = logging.getLogger(__name__)
+
+
+def partition_of(record_id: str, n_partitions: int) -> int:
+    """Stable partition index for a record id (independent of ``PYTHONHASHSEED``)."""
+    digest = hashlib.blake2b(record_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % n_partitions
+
+
+def _segment_path(out_dir: Path, index: int) -> Path:
+    return out_dir / f"part-{index:05d}.jsonl.gz"
+
+
+def _stats_path(out_dir: Path, index: int) -> Path:
+    return out_dir / f"part-{index:05d}.stats.json"
+
+
+def iter_raw(source: Path) -> Iterator[Dict[str, Any]]:
+    """Yield raw rows from a CSV or JSON-lines file."""
+    source = Path(source)
+    if source.suffix.lower() == ".csv":
+        with source.open(newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        with source.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _normalize_stable(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """``normalize_record`` with a content-derived id for identifier-less rows.
+
+    ``normalize_record`` falls back to a random uuid4, which would make such rows
+    land in a different partition on every node that reads the input.
+    """
+    rec = normalize_record(raw)
+    if uuid.UUID(rec["record_id"]).version == 4:
+        content = json.dumps(raw, sort_keys=True, default=str)
+        rec["record_id"] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"content:{content}"))
+    return rec
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {"count": 0, "sums": {k: 0.0 for k in SCORE_KEYS}}
+
+
+def _add_stats(stats: Dict[str, Any], scores: Dict[str, float]) -> None:
+    stats["count"] += 1
+    for k in SCORE_KEYS:
+        stats["sums"][k] += float(scores.get(k) or 0.0)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def run_partition(source: Path, out_dir: Path, index: int, n_partitions: int,
+                  profile: Optional[str] = None) -> Dict[str, Any]:
+    """Enrich and score the records of one partition and write its outputs.
+
+    Returns the partition's partial stats. Re-running a partition overwrites
+    its previous outputs, so failed partitions can simply be retried.
+    """
+    if not 0 <= index < n_partitions:
+        raise ValueError(f"Partition index {index} out of range for {n_partitions} partitions")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _stats_path(out_dir, index).unlink(missing_ok=True)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for raw in iter_raw(source):
+        rec = _normalize_stable(raw)
+        if partition_of(rec["record_id"], n_partitions) != index:
+            continue
+        rec = enrich_record(rec)
+        results[rec["record_id"]] = {"record": rec, "result": score_record(rec, profile)}
+
+    stats = _empty_stats()
+    sketch = ScoreSketch()
+    seg = _segment_path(out_dir, index)
+    tmp = seg.with_name(seg.name + ".tmp")
+    with gzip.GzipFile(tmp, "wb", mtime=0) as gz:
+        for rid in sorted(results):
+            item = results[rid]
+            _add_stats(stats, item["result"]["scores"])
+            sketch.add(item["result"]["scores"])
+            gz.write(json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+            gz.write(b"\n")
+    os.replace(tmp, seg)
+
+    stats.update({"partition": index, "n_partitions": n_partitions, "sketch": sketch.to_dict()})
+    _write_atomic(_stats_path(out_dir, index), json.dumps(stats, sort_keys=True).encode("utf-8"))
+    logger.info("Partition %d/%d: %d records", index, n_partitions, stats["count"])
+    return stats
+
+
+def run_local(source: Path, out_dir: Path, n_partitions: int, workers: Optional[int] = None,
+              profile: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Run every partition in a local process pool."""
+    workers = workers or min(n_partitions, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_partition, source, out_dir, i, n_partitions, profile)
+                   for i in range(n_partitions)]
+        return [f.result() for f in futures]
+
+
+def iter_segment(out_dir: Path, index: int) -> Iterator[Dict[str, Any]]:
+    with gzip.open(_segment_path(Path(out_dir), index), "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def merge(out_dir: Path, n_partitions: int, write_store: bool = True,
+          batch_size: int = 500) -> Dict[str, Any]:
+    """Combine finished partitions into the report store and one summary.
+
+    Raises ``FileNotFoundError`` if any partition has not completed. Partitions
+    are folded in index order so the summary is deterministic.
+    """
+    out_dir = Path(out_dir)
+    missing = [i for i in range(n_partitions) if not _stats_path(out_dir, i).exists()]
+    if missing:
+        raise FileNotFoundError(f"Partitions not finished: {missing}")
+
+    total = _empty_stats()
+    sketch = ScoreSketch()
+    for i in range(n_partitions):
+        part = json.loads(_stats_path(out_dir, i).read_text(encoding="utf-8"))
+        if part.get("n_partitions") != n_partitions:
+            raise ValueError(f"Partition {i} was produced for {part.get('n_partitions')} partitions")
+        total["count"] += part["count"]
+        for k in SCORE_KEYS:
+            total["sums"][k] = math.fsum([total["sums"][k], part["sums"][k]])
+        sketch.merge(ScoreSketch.from_dict(part.get("sketch")))
+
+        if write_store:
+            batch = []
+            for item in iter_segment(out_dir, i):
+                batch.append((item["record"], item["result"]))
+                if len(batch) >= batch_size:
+                    write_reports_many(batch)
+                    batch = []
+            write_reports_many(batch)
+
+    n = total["count"]
+    summary = {
+        "count": n,
+        "n_partitions": n_partitions,
+        "sums": {k: round(v, 6) for k, v in total["sums"].items()},
+        "means": {k: round(v / n, 3) if n else None for k, v in total["sums"].items()},
+        "distribution": sketch.summary(),
+        "sketch": sketch.to_dict(),
+    }
+    _write_atomic(out_dir / "summary.json", json.dumps(summary, indent=2, sort_keys=True).encode("utf-8"))
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m fairmeta.batch", description="Partitioned batch scoring.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("run", "partition", "merge"):
+        p = sub.add_parser(name)
+        p.add_argument("--out", type=Path, required=True, help="Run directory shared by all partitions")
+        p.add_argument("--partitions", type=int, required=True)
+        if name != "merge":
+            p.add_argument("--input", type=Path, required=True, help="CSV or JSON-lines file")
+            p.add_argument("--profile", default=None, help="Rule profile name or path")
+        if name == "run":
+            p.add_argument("--workers", type=int, default=None)
+            p.add_argument("--no-merge", action="store_true")
+        if name == "partition":
+            p.add_argument("--index", type=int, required=True)
+        if name == "merge":
+            p.add_argument("--summary-only", action="store_true",
+                           help="Only combine stats; do not write reports or the catalogue")
+    args = ap.parse_args(argv)
+    if args.partitions < 1:
+        ap.error("--partitions must be at least 1")
+    if args.cmd == "partition" and not 0 <= args.index < args.partitions:
+        ap.error(f"--index must satisfy 0 <= index < {args.partitions}")
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if args.cmd == "partition":
+        run_partition(args.input, args.out, args.index, args.partitions, args.profile)
+    elif args.cmd == "run":
+        run_local(args.input, args.out, args.partitions, args.workers, args.profile)
+        if not args.no_merge:
+            print(json.dumps(merge(args.out, args.partitions), indent=2))
+    else:
+        print(json.dumps(merge(args.out, args.partitions, write_store=not args.summary_only), indent=2))
+
+
+if __name__ == "__main__":
+    main()
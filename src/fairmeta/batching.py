@@ -0,0 +1,140 @@
+"""Dynamic micro-batching for request/response workloads.
+
+Models such as spaCy process a batch of documents far faster than the same
+documents one at a time. :class:`MicroBatcher` lets many concurrent requests
+share that speed-up: each request awaits :meth:`MicroBatcher.submit`, the
+batcher collects items until it has ``max_batch_size`` of them or the oldest
+has waited ``max_wait_ms``, then runs the batch function once in a worker
+thread and hands every caller its own result.
+
+The queue is bounded; when it is full :meth:`submit` raises
+:class:`BatcherOverloaded` straight away so the API can shed load instead of
+queueing without limit.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BatcherOverloaded(RuntimeError):
+    """Raised when the batcher queue is full."""
+
+
+class MicroBatcher:
+    """Collect concurrent submissions into batches for ``batch_fn``.
+
+    Parameters
+    ----------
+    batch_fn:
+        Synchronous function mapping a list of items to a list of results of
+        the same length and order. It runs in the default thread pool so the
+        event loop stays responsive.
+    max_batch_size:
+        Largest batch handed to ``batch_fn``.
+    max_wait_ms:
+        How long the first item of a batch may wait for more to arrive.
+    max_queue:
+        Maximum number of items waiting to be batched.
+    """
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_queue: int = 1024):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue = max(1, int(max_queue))
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats: Dict[str, Any] = {
+            "submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+            "batches": 0, "batch_size_hist": {}, "max_queue_depth": 0,
+            "total_wait_ms": 0.0, "total_batch_ms": 0.0,
+        }
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` and wait for its result from the next batch."""
+        queue = self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            queue.put_nowait((item, fut, time.perf_counter()))
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            raise BatcherOverloaded(f"Batch queue is full ({self.max_queue} items)") from None
+        self._stats["submitted"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], queue.qsize())
+        return await fut
+
+    async def _collect(self, queue: asyncio.Queue) -> List[Tuple[Any, asyncio.Future, float]]:
+        batch = [await queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                while len(batch) < self.max_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(queue)
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.batch_fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as exc:
+                logger.warning("Micro-batch of %d items failed: %s", len(items), exc)
+                self._stats["failed"] += len(items)
+                for _, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            finished = time.perf_counter()
+            for (_, fut, enqueued), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+                self._stats["total_wait_ms"] += (started - enqueued) * 1000.0
+            size = len(items)
+            hist = self._stats["batch_size_hist"]
+            hist[size] = hist.get(size, 0) + 1
+            self._stats["batches"] += 1
+            self._stats["completed"] += size
+            self._stats["total_batch_ms"] += (finished - started) * 1000.0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters plus derived averages, suitable for a JSON metrics endpoint."""
+        s = self._stats
+        batches, completed = s["batches"], s["completed"]
+        return {
+            "config": {"max_batch_size": self.max_batch_size, "max_wait_ms": self.max_wait * 1000.0,
+                       "max_queue": self.max_queue},
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": s["max_queue_depth"],
+            "submitted": s["submitted"], "completed": completed,
+            "failed": s["failed"], "rejected": s["rejected"], "batches": batches,
+            "mean_batch_size": completed / batches if batches else 0.0,
+            "mean_queue_wait_ms": s["total_wait_ms"] / completed if completed else 0.0,
+            "mean_batch_ms": s["total_batch_ms"] / batches if batches else 0.0,
+            "batch_size_hist": {str(k): v for k, v in sorted(s["batch_size_hist"].items())},
+        }
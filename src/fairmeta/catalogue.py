@@ -0,0 +1,513 @@
+"""SQLite-backed catalogue and full-text index of scored records.
+
+The JSON reports under ``reports/json`` remain the source of truth, but listing,
+filtering and sorting them means reading every file. The catalogue keeps one row
+per record with the normalised record, its enrichment and the FAIR scores, and
+indexes the columns the UI and API filter or sort on, so those queries run in
+the database and only return the page that is actually displayed.
+
+A companion FTS5 table indexes title, description, keywords and enrichment
+subjects. Triggers on ``records`` keep it in step with every upsert, so new
+harvests are searchable as soon as they are scored without any refit.
+
+Records removed at their source are kept as tombstones (``deleted_at`` set)
+and are hidden from queries and search unless explicitly requested.
+
+Score distributions are kept as :class:`~fairmeta.stats_utils.ScoreSketch`
+rows, updated in the same transaction as each write: ``current`` describes the
+live catalogue (a re-scored record's previous scores are subtracted) and
+``day:YYYY-MM-DD`` collects every scoring event of that UTC day. Percentile
+and histogram dashboards read one row instead of scanning the records.
+
+The database runs in WAL mode so the API, the Streamlit console and batch jobs
+can read while another process writes.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+
+from .config import CATALOGUE_DB, ensure_dir
+from .serialization import iter_report_paths, read_report
+from .stats_utils import ScoreSketch
+
+SCORE_COLUMNS = ("F", "A", "I", "R", "total")
+TEXT_FILTERS = ("identifier", "license", "format", "publisher")
+SORTABLE_COLUMNS = ("title", "identifier", "record_id", "updated_at", *SCORE_COLUMNS)
+SUMMARY_COLUMNS = ("record_id", "identifier", "title", *SCORE_COLUMNS)
+SEARCH_FIELDS = ("title", "description", "keywords", "subjects")
+# bm25 column weights, in SEARCH_FIELDS order
+SEARCH_WEIGHTS = (4.0, 1.0, 2.0, 2.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    record_id  TEXT PRIMARY KEY,
+    identifier TEXT NOT NULL DEFAULT '',
+    title      TEXT NOT NULL DEFAULT '',
+    license    TEXT NOT NULL DEFAULT '',
+    format     TEXT NOT NULL DEFAULT '',
+    publisher  TEXT NOT NULL DEFAULT '',
+    "F"        REAL,
+    "A"        REAL,
+    "I"        REAL,
+    "R"        REAL,
+    "total"    REAL,
+    record     TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    deleted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_identifier ON records(identifier);
+CREATE INDEX IF NOT EXISTS idx_records_F ON records("F");
+CREATE INDEX IF NOT EXISTS idx_records_A ON records("A");
+CREATE INDEX IF NOT EXISTS idx_records_I ON records("I");
+CREATE INDEX IF NOT EXISTS idx_records_R ON records("R");
+CREATE INDEX IF NOT EXISTS idx_records_total ON records("total");
+CREATE TABLE IF NOT EXISTS score_sketches (
+    window TEXT PRIMARY KEY,
+    data   TEXT NOT NULL
+);
+"""
+
+_FTS_VALUES = """
+    json_extract({row}.record, '$.title'),
+    json_extract({row}.record, '$.description'),
+    (SELECT group_concat(value, ' ') FROM json_each({row}.record, '$.keywords')),
+    (SELECT group_concat(value, ' ') FROM json_each({row}.record, '$.enrichment.canonical_subjects'))
+"""
+
+_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    title, description, keywords, subjects, tokenize = 'porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts(rowid, title, description, keywords, subjects)
+    VALUES (new.rowid, {_FTS_VALUES.format(row="new")});
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF record ON records BEGIN
+    DELETE FROM records_fts WHERE rowid = old.rowid;
+    INSERT INTO records_fts(rowid, title, description, keywords, subjects)
+    VALUES (new.rowid, {_FTS_VALUES.format(row="new")});
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN
+    DELETE FROM records_fts WHERE rowid = old.rowid;
+END;
+"""
+
+_FTS_BACKFILL = f"""
+INSERT INTO records_fts(rowid, title, description, keywords, subjects)
+SELECT r.rowid, {_FTS_VALUES.format(row="r")} FROM records AS r
+WHERE r.rowid NOT IN (SELECT rowid FROM records_fts)
+"""
+
+_UPSERT = """
+INSERT INTO records (record_id, identifier, title, license, format, publisher,
+                     "F", "A", "I", "R", "total", record, result, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(record_id) DO UPDATE SET
+    identifier = excluded.identifier, title = excluded.title,
+    license = excluded.license, format = excluded.format,
+    publisher = excluded.publisher,
+    "F" = excluded."F", "A" = excluded."A", "I" = excluded."I",
+    "R" = excluded."R", "total" = excluded."total",
+    record = excluded.record, result = excluded.result,
+    updated_at = excluded.updated_at, deleted_at = NULL
+"""
+
+
+def _match_expression(text: str, fields: Optional[Iterable[str]] = None) -> str:
+    """Turn free text into an FTS5 query: every term must match, as a prefix.
+
+    Terms are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    terms = [t.replace('"', '""') for t in text.split()]
+    expr = " ".join(f'"{t}"*' for t in terms if t)
+    if not expr:
+        return ""
+    fields = list(fields or [])
+    for f in fields:
+        if f not in SEARCH_FIELDS:
+            raise ValueError(f"Cannot search field {f!r}; expected one of {SEARCH_FIELDS}")
+    return f"{{{' '.join(fields)}}} : ({expr})" if fields else expr
+
+
+def _filter_clauses(where: Optional[Dict[str, str]],
+                    min_scores: Optional[Dict[str, float]],
+                    max_scores: Optional[Dict[str, float]],
+                    include_deleted: bool = False,
+                    table: str = "records") -> Tuple[List[str], List[Any]]:
+    clauses: List[str] = [] if include_deleted else [f"{table}.deleted_at IS NULL"]
+    params: List[Any] = []
+    for col, value in (where or {}).items():
+        if col not in TEXT_FILTERS:
+            raise ValueError(f"Cannot filter on {col!r}; expected one of {TEXT_FILTERS}")
+        clauses.append(f"{table}.{col} = ?")
+        params.append(value)
+    for bounds, op in ((min_scores, ">="), (max_scores, "<=")):
+        for col, value in (bounds or {}).items():
+            if col not in SCORE_COLUMNS:
+                raise ValueError(f"Unknown score column {col!r}")
+            clauses.append(f'{table}."{col}" {op} ?')
+            params.append(float(value))
+    return clauses, params
+
+
+def _row_values(rec: Dict[str, Any], scoring: Dict[str, Any], now: str) -> Tuple:
+    s = scoring.get("scores", {})
+    return (
+        str(rec.get("record_id", "unknown")),
+        str(rec.get("identifier") or ""),
+        str(rec.get("title") or ""),
+        str(rec.get("license") or ""),
+        str(rec.get("format") or ""),
+        str(rec.get("publisher") or ""),
+        *(s.get(col) for col in SCORE_COLUMNS),
+        json.dumps(rec, ensure_ascii=False, separators=(",", ":")),
+        json.dumps(scoring, ensure_ascii=False, separators=(",", ":")),
+        now,
+    )
+
+
+class Catalogue:
+    """Queryable store of normalised records, enrichment and scores.
+
+    Parameters
+    ----------
+    path:
+        Location of the SQLite database. Defaults to ``config.CATALOGUE_DB``.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or CATALOGUE_DB)
+        self._schema_ready = False
+        self._lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection; callers own it and should close it.
+
+        A connection per operation keeps the class safe to share between the
+        FastAPI thread pool and Streamlit script threads. This is the write
+        path: it creates the directory and the database if they are missing.
+        """
+        ensure_dir(self.path.parent)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    con.execute("PRAGMA journal_mode=WAL")
+                    con.executescript(_SCHEMA)
+                    columns = {r[1] for r in con.execute("PRAGMA table_info(records)")}
+                    if "deleted_at" not in columns:  # catalogues created before tombstones
+                        con.execute("ALTER TABLE records ADD COLUMN deleted_at TEXT")
+                    with con:
+                        con.executescript(_FTS_SCHEMA)
+                        con.execute(_FTS_BACKFILL)
+                    if con.execute("SELECT 1 FROM score_sketches WHERE window = 'current'").fetchone() is None:
+                        with con:  # catalogues created before sketches
+                            self._save_sketch(con, "current", self._scan_sketch(con))
+                    self._schema_ready = True
+        return con
+
+    def _connect_existing(self) -> Optional[sqlite3.Connection]:
+        """A connection for reads, or ``None`` while nothing has been written.
+
+        Reads answer from an empty catalogue instead of creating ``reports/``
+        and an empty database.
+        """
+        if not self.path.exists():
+            return None
+        return self.connect()
+
+    # --- sketches -----------------------------------------------------------
+    @staticmethod
+    def _load_sketch(con: sqlite3.Connection, window: str) -> ScoreSketch:
+        row = con.execute("SELECT data FROM score_sketches WHERE window = ?", (window,)).fetchone()
+        return ScoreSketch.from_dict(json.loads(row[0]) if row else None)
+
+    @staticmethod
+    def _save_sketch(con: sqlite3.Connection, window: str, sketch: ScoreSketch) -> None:
+        con.execute("INSERT OR REPLACE INTO score_sketches VALUES (?, ?)",
+                    (window, json.dumps(sketch.to_dict(), separators=(",", ":"))))
+
+    @staticmethod
+    def _scan_sketch(con: sqlite3.Connection) -> ScoreSketch:
+        cols = ", ".join(f'"{c}"' for c in SCORE_COLUMNS)
+        rows = con.execute(f"SELECT {cols} FROM records WHERE deleted_at IS NULL")
+        return ScoreSketch.from_scores(dict(zip(SCORE_COLUMNS, r)) for r in rows)
+
+    @staticmethod
+    def _live_scores(con: sqlite3.Connection, record_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        cols = ", ".join(f'"{c}"' for c in SCORE_COLUMNS)
+        out: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(record_ids), 500):
+            chunk = record_ids[i:i + 500]
+            for r in con.execute(f"SELECT record_id, {cols} FROM records WHERE deleted_at IS NULL "
+                                 f"AND record_id IN ({','.join('?' * len(chunk))})", chunk):
+                out[r[0]] = dict(zip(SCORE_COLUMNS, tuple(r)[1:]))
+        return out
+
+    def sketch(self, window: str = "current") -> ScoreSketch:
+        """Score distribution for ``current`` or a ``day:YYYY-MM-DD`` window."""
+        con = self._connect_existing()
+        if con is None:
+            return ScoreSketch()
+        try:
+            return self._load_sketch(con, window)
+        finally:
+            con.close()
+
+    def sketch_range(self, start: Optional[str] = None, end: Optional[str] = None) -> ScoreSketch:
+        """Merge the daily windows from ``start`` to ``end`` (``YYYY-MM-DD``, inclusive)."""
+        con = self._connect_existing()
+        if con is None:
+            return ScoreSketch()
+        try:
+            rows = con.execute("SELECT data FROM score_sketches WHERE window >= ? AND window <= ?",
+                               (f"day:{start or ''}", f"day:{end or '9999-12-31'}")).fetchall()
+        finally:
+            con.close()
+        merged = ScoreSketch()
+        for (data,) in rows:
+            merged.merge(ScoreSketch.from_dict(json.loads(data)))
+        return merged
+
+    def sketch_windows(self) -> List[str]:
+        con = self._connect_existing()
+        if con is None:
+            return []
+        try:
+            return [r[0] for r in con.execute("SELECT window FROM score_sketches ORDER BY window")]
+        finally:
+            con.close()
+
+    def rebuild_sketch(self) -> ScoreSketch:
+        """Recompute the ``current`` sketch from the records table."""
+        con = self.connect()
+        try:
+            with con:
+                sketch = self._scan_sketch(con)
+                self._save_sketch(con, "current", sketch)
+        finally:
+            con.close()
+        return sketch
+
+    # --- writes -------------------------------------------------------------
+    def upsert_many(self, items: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """Insert or replace ``(record, scoring)`` pairs in a single transaction."""
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        rows = [_row_values(rec, scoring, now) for rec, scoring in items]
+        if not rows:
+            return 0
+        day = f"day:{now_dt.date().isoformat()}"
+        n_cols = len(SCORE_COLUMNS)
+        con = self.connect()
+        try:
+            with con:
+                con.execute("BEGIN IMMEDIATE")  # sketches are read-modify-write
+                previous = self._live_scores(con, list({r[0] for r in rows}))
+                current, daily = self._load_sketch(con, "current"), self._load_sketch(con, day)
+                for r in rows:
+                    scores = dict(zip(SCORE_COLUMNS, r[6:6 + n_cols]))
+                    if r[0] in previous:
+                        current.remove(previous[r[0]])
+                    current.add(scores)
+                    daily.add(scores)
+                    previous[r[0]] = scores
+                con.executemany(_UPSERT, rows)
+                self._save_sketch(con, "current", current)
+                self._save_sketch(con, day, daily)
+        finally:
+            con.close()
+        return len(rows)
+
+    def upsert(self, rec: Dict[str, Any], scoring: Dict[str, Any]) -> None:
+        self.upsert_many([(rec, scoring)])
+
+    def mark_deleted(self, record_ids: Iterable[str]) -> int:
+        """Tombstone records removed at their source; returns how many were live."""
+        now = datetime.now(timezone.utc).isoformat()
+        record_ids = list(dict.fromkeys(record_ids))
+        con = self.connect()
+        try:
+            with con:
+                con.execute("BEGIN IMMEDIATE")
+                live = self._live_scores(con, record_ids)
+                cur = con.executemany(
+                    "UPDATE records SET deleted_at = ? WHERE record_id = ? AND deleted_at IS NULL",
+                    [(now, rid) for rid in record_ids])
+                if live:
+                    current = self._load_sketch(con, "current")
+                    for scores in live.values():
+                        current.remove(scores)
+                    self._save_sketch(con, "current", current)
+                return cur.rowcount
+        finally:
+            con.close()
+
+    def sync_from_reports(self, directory: Optional[Path] = None, batch_size: int = 500) -> int:
+        """Backfill the catalogue from reports written before it existed."""
+        count = 0
+        batch: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        for path in iter_report_paths(directory):
+            try:
+                data = read_report(path)
+                batch.append((data["record"], data["result"]))
+            except Exception:
+                continue
+            if len(batch) >= batch_size:
+                count += self.upsert_many(batch)
+                batch = []
+        return count + self.upsert_many(batch)
+
+    # --- reads --------------------------------------------------------------
+    def count(self, include_deleted: bool = False) -> int:
+        sql = "SELECT COUNT(*) FROM records" + ("" if include_deleted else " WHERE deleted_at IS NULL")
+        con = self._connect_existing()
+        if con is None:
+            return 0
+        try:
+            return con.execute(sql).fetchone()[0]
+        finally:
+            con.close()
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Return ``{"record": ..., "result": ...}`` for one record, or ``None``."""
+        con = self._connect_existing()
+        if con is None:
+            return None
+        try:
+            row = con.execute("SELECT record, result, deleted_at FROM records WHERE record_id = ?",
+                              (record_id,)).fetchone()
+        finally:
+            con.close()
+        if row is None:
+            return None
+        return {"record": json.loads(row["record"]), "result": json.loads(row["result"]),
+                "deleted_at": row["deleted_at"]}
+
+    def query(self,
+              q: Optional[str] = None,
+              where: Optional[Dict[str, str]] = None,
+              min_scores: Optional[Dict[str, float]] = None,
+              max_scores: Optional[Dict[str, float]] = None,
+              sort: str = "total",
+              descending: bool = True,
+              limit: int = 50,
+              offset: int = 0,
+              include_deleted: bool = False) -> Dict[str, Any]:
+        """Filter, sort and paginate the catalogue server-side.
+
+        Parameters
+        ----------
+        q:
+            Case-insensitive substring matched against the title.
+        where:
+            Exact matches on any of ``TEXT_FILTERS``.
+        min_scores, max_scores:
+            Inclusive bounds keyed by score column (``F``, ``A``, ``I``, ``R``,
+            ``total``).
+        sort, descending:
+            Sort column (one of ``SORTABLE_COLUMNS``) and direction.
+        limit, offset:
+            Page window.
+        include_deleted:
+            Also return tombstoned records.
+
+        Returns
+        -------
+        dict with keys ``total`` (matching rows) and ``items`` (summary rows of
+        the requested page).
+        """
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort!r}; expected one of {SORTABLE_COLUMNS}")
+        clauses, params = _filter_clauses(where, min_scores, max_scores, include_deleted)
+        if q:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if descending else "ASC"
+        columns = ", ".join(f'"{c}"' for c in SUMMARY_COLUMNS)
+
+        con = self._connect_existing()
+        if con is None:
+            return {"total": 0, "items": []}
+        try:
+            total = con.execute(f"SELECT COUNT(*) FROM records {where_sql}", params).fetchone()[0]
+            rows = con.execute(
+                f'SELECT {columns} FROM records {where_sql} '
+                f'ORDER BY "{sort}" {direction}, record_id LIMIT ? OFFSET ?',
+                [*params, max(int(limit), 0), max(int(offset), 0)],
+            ).fetchall()
+        finally:
+            con.close()
+        return {"total": total, "items": [dict(r) for r in rows]}
+
+    def search(self,
+               text: str,
+               fields: Optional[Iterable[str]] = None,
+               where: Optional[Dict[str, str]] = None,
+               min_scores: Optional[Dict[str, float]] = None,
+               max_scores: Optional[Dict[str, float]] = None,
+               limit: int = 20,
+               offset: int = 0,
+               include_deleted: bool = False) -> Dict[str, Any]:
+        """Ranked full-text search over the catalogue.
+
+        Parameters
+        ----------
+        text:
+            Free text; every term must match (as a prefix) in some field.
+        fields:
+            Restrict matching to a subset of ``SEARCH_FIELDS``.
+        where, min_scores, max_scores, include_deleted:
+            Same filters as :meth:`query`.
+        limit, offset:
+            Page window.
+
+        Returns
+        -------
+        dict with keys ``total`` and ``items``; items are summary rows plus a
+        BM25 ``score`` (higher is better).
+        """
+        match = _match_expression(text, fields)
+        if not match:
+            return {"total": 0, "items": []}
+        clauses, params = _filter_clauses(where, min_scores, max_scores, include_deleted, table="r")
+        clauses.insert(0, "records_fts MATCH ?")
+        params.insert(0, match)
+        where_sql = " AND ".join(clauses)
+        columns = ", ".join(f'r."{c}"' for c in SUMMARY_COLUMNS)
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        base = "FROM records_fts JOIN records AS r ON r.rowid = records_fts.rowid"
+
+        con = self._connect_existing()
+        if con is None:
+            return {"total": 0, "items": []}
+        try:
+            total = con.execute(f"SELECT COUNT(*) {base} WHERE {where_sql}", params).fetchone()[0]
+            rows = con.execute(
+                f"SELECT {columns}, -bm25(records_fts, {weights}) AS score {base} "
+                f"WHERE {where_sql} ORDER BY bm25(records_fts, {weights}) LIMIT ? OFFSET ?",
+                [*params, max(int(limit), 0), max(int(offset), 0)],
+            ).fetchall()
+        finally:
+            con.close()
+        return {"total": total, "items": [dict(r) for r in rows]}
+
+
+_DEFAULT: Optional[Catalogue] = None
+
+
+def get_catalogue() -> Catalogue:
+    """Return the process-wide catalogue at ``config.CATALOGUE_DB``."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Catalogue()
+    return _DEFAULT
@@ -1,13 +1,55 @@
 from pathlib import Path
+import os
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
-REPORTS_DIR = PROJECT_ROOT / "reports"
+REPORTS_DIR = Path(os.environ.get("FAIRMETA_REPORTS_DIR", PROJECT_ROOT / "reports"))
 REPORTS_JSON = REPORTS_DIR / "json"
 REPORTS_MD = REPORTS_DIR / "md"
-DATA_DIR = PROJECT_ROOT / "data"
+DATA_DIR = Path(os.environ.get("FAIRMETA_DATA_DIR", PROJECT_ROOT / "data"))
+CATALOGUE_DB = REPORTS_DIR / "catalogue.sqlite"
+# json | json.gz | json.zst | msgpack (see fairmeta.serialization)
+REPORT_FORMAT = os.environ.get("FAIRMETA_REPORT_FORMAT", "json")
+# bundled rule profile name or path to a JSON/YAML profile (see fairmeta.rules)
+SCORING_PROFILE = os.environ.get("FAIRMETA_PROFILE", "default")
+# seconds a resolved profile is reused before its file is stat()ed again for edits
+PROFILE_RECHECK_SECONDS = float(os.environ.get("FAIRMETA_PROFILE_RECHECK", "2"))
+# micro-batching of POST /enrich/advanced (see fairmeta.batching)
+ENRICH_BATCH_MAX_SIZE = int(os.environ.get("FAIRMETA_ENRICH_BATCH_MAX_SIZE", "32"))
+ENRICH_BATCH_MAX_WAIT_MS = float(os.environ.get("FAIRMETA_ENRICH_BATCH_MAX_WAIT_MS", "5"))
+ENRICH_QUEUE_LIMIT = int(os.environ.get("FAIRMETA_ENRICH_QUEUE_LIMIT", "1024"))
+# POST /score result cache: memory | sqlite (shared by workers) | off (see fairmeta.score_cache)
+SCORE_CACHE_BACKEND = os.environ.get("FAIRMETA_SCORE_CACHE", "memory")
+SCORE_CACHE_SIZE = int(os.environ.get("FAIRMETA_SCORE_CACHE_SIZE", "10000"))
+SCORE_CACHE_TTL = float(os.environ.get("FAIRMETA_SCORE_CACHE_TTL", "3600"))
+SCORE_CACHE_DB = DATA_DIR / "score_cache.sqlite"
+# link verification of landing_page/access_url (see fairmeta.linkcheck)
+LINKCHECK_TTL = float(os.environ.get("FAIRMETA_LINKCHECK_TTL", "86400"))
+LINKCHECK_PER_HOST = int(os.environ.get("FAIRMETA_LINKCHECK_PER_HOST", "4"))
+LINKCHECK_CONCURRENCY = int(os.environ.get("FAIRMETA_LINKCHECK_CONCURRENCY", "64"))
+LINKCHECK_TIMEOUT = float(os.environ.get("FAIRMETA_LINKCHECK_TIMEOUT", "10"))
+LINKCHECK_DB = DATA_DIR / "linkcheck.sqlite"
+# append-only score history (see fairmeta.history); FAIRMETA_HISTORY=0 disables it
+HISTORY_DIR = REPORTS_DIR / "history"
+HISTORY_ENABLED = os.environ.get("FAIRMETA_HISTORY", "1") not in ("0", "false", "off")
+HISTORY_COMPACT_ROWS = int(os.environ.get("FAIRMETA_HISTORY_COMPACT_ROWS", "100000"))
+# near-duplicate detection at write time (see fairmeta.dedup); FAIRMETA_DEDUP=0 disables it
+DEDUP_ENABLED = os.environ.get("FAIRMETA_DEDUP", "1") not in ("0", "false", "off")
+DEDUP_THRESHOLD = float(os.environ.get("FAIRMETA_DEDUP_THRESHOLD", "0.8"))
+DEDUP_DB = DATA_DIR / "dedup.sqlite"
+# worker processes for building the recommender catalogue from the UI (see fairmeta.recommendation)
+RECOMMENDER_JOBS = int(os.environ.get("FAIRMETA_RECOMMENDER_JOBS", "2"))
 
-for p in [REPORTS_DIR, REPORTS_JSON, REPORTS_MD, DATA_DIR]:
-    p.mkdir(parents=True, exist_ok=True)
+_ENSURED_DIRS = set()
+
+def ensure_dir(path: Path) -> Path:
+    """Create ``path`` (once per process) right before something is written there.
+
+    Importing the package never touches the filesystem.
+    """
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
 
 CONTROLLED_VOCAB = {
     "machine learning": ["ai", "artificial intelligence", "ml", "neural network", "deep learning"],
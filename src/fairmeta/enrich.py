@@ -1,24 +1,26 @@
 from __future__ import annotations
-import re
 from typing import Dict, Any
 from .config import CONTROLLED_VOCAB
-
-DOI_RX = re.compile(r"(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)")
-HANDLE_RX = re.compile(r"(?:hdl:)?\d{4,5}/[A-Za-z0-9.\-_/]+")
-URL_RX = re.compile(r"https?://[^\s]+")
-EMAIL_RX = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+from .identifiers import ORCID_RX, extract, extract_dois, extract_urls, orcid_valid
+# the patterns used to be defined here; re-exported so existing imports keep working
+from .identifiers import DOI_RX, HANDLE_RX, URL_RX, EMAIL_RX  # noqa: F401
+from .text_features import for_record
 
 def enrich_record(rec: Dict[str, Any]) -> Dict[str, Any]:
-    text_blob = " ".join([str(rec.get("title","")), str(rec.get("description","")), " ".join(rec.get("keywords",[]))])
-    dois = DOI_RX.findall(text_blob) or DOI_RX.findall(rec.get("identifier","") or "")
-    handles = HANDLE_RX.findall(text_blob)
-    urls = URL_RX.findall(text_blob) + URL_RX.findall(rec.get("landing_page","")) + URL_RX.findall(rec.get("access_url",""))
-    emails = EMAIL_RX.findall(text_blob)
+    feats = for_record(rec)
+    text_blob = feats.blob
+    found = extract(text_blob)
+    dois = found["dois"] or extract_dois(rec.get("identifier","") or "")
+    handles = found["handles"]
+    urls = found["urls"] + extract_urls([rec.get("landing_page",""), rec.get("access_url","")])
+    emails = found["emails"]
+    orcids = found["orcids"]
     for c in rec.get("creators", []):
         if c.get("email"): emails.append(c["email"])
+        orcids.extend(o for o in ORCID_RX.findall(str(c.get("orcid") or "")) if orcid_valid(o))
 
     suggested = set()
-    lower_text = text_blob.lower()
+    lower_text = feats.lower
     for canonical, aliases in CONTROLLED_VOCAB.items():
         if canonical in lower_text or any(a in lower_text for a in aliases):
             suggested.add(canonical)
@@ -33,6 +35,7 @@ def enrich_record(rec: Dict[str, Any]) -> Dict[str, Any]:
         "detected_handles": list(dict.fromkeys(handles)),
         "detected_urls": list(dict.fromkeys(urls)),
         "detected_emails": list(dict.fromkeys(emails)),
+        "detected_orcids": list(dict.fromkeys(orcids)),
         "suggested_keywords": sorted(suggested),
         "keyword_union": sorted(set([*rec.get("keywords",[]), *suggested])),
         "canonical_subjects": sorted(suggested),
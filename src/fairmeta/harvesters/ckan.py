@@ -1,16 +1,55 @@
 from __future__ import annotations
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 from ..ingest import normalize_record
 
-def fetch_ckan_dataset(base_url: str, dataset_id: str) -> Dict[str, Any]:
-    api = f"{base_url.rstrip('/')}/api/3/action/package_show"
-    r = requests.get(api, params={"id": dataset_id}, timeout=30)
+def _action(base_url: str, action: str, session=None, **params) -> Any:
+    api = f"{base_url.rstrip('/')}/api/3/action/{action}"
+    r = (session or requests).get(api, params=params, timeout=30)
     r.raise_for_status()
     res = r.json()
     if not res.get("success"):
-        raise ValueError(f"CKAN lookup failed: {res}")
-    pkg = res["result"]
+        raise ValueError(f"CKAN {action} failed: {res}")
+    return res["result"]
+
+def fetch_ckan_dataset(base_url: str, dataset_id: str) -> Dict[str, Any]:
+    return map_ckan_package(base_url, _action(base_url, "package_show", id=dataset_id))
+
+def _solr_datetime(ts: str) -> str:
+    ts = ts.replace("+00:00", "Z")
+    return ts if ts.endswith("Z") else ts + "Z"
+
+def iter_ckan_modified_since(base_url: str, since: Optional[str], rows: int = 500,
+                             session=None) -> Iterator[Dict[str, Any]]:
+    """Yield raw CKAN packages with ``metadata_modified >= since`` (all if ``since`` is None), oldest first.
+
+    Pages by keyset rather than offset: each page asks for packages modified at
+    or after the last timestamp seen and drops ids already yielded at that
+    timestamp. With offsets, a package modified mid-sync moves to the end of
+    the ordering, every later row shifts down and the next page skips one.
+    """
+    cursor, seen, start = since, set(), 0
+    while True:
+        fq = f"metadata_modified:[{_solr_datetime(cursor)} TO *]" if cursor else ""
+        res = _action(base_url, "package_search", session=session, fq=fq, rows=rows, start=start,
+                      sort="metadata_modified asc, id asc")
+        pkgs = res.get("results", [])
+        yield from (p for p in pkgs if p.get("id") not in seen)
+        if not pkgs or start + len(pkgs) >= res.get("count", 0):
+            break
+        last = pkgs[-1].get("metadata_modified")
+        if last != cursor:
+            cursor, start = last, 0
+            seen = {p.get("id") for p in pkgs if p.get("metadata_modified") == last}
+        else:  # a whole page shares the cursor timestamp: step through it by offset
+            start += len(pkgs)
+            seen.update(p.get("id") for p in pkgs)
+
+def list_ckan_dataset_names(base_url: str, session=None) -> List[str]:
+    """Names of all active datasets on the portal (cheap: no metadata)."""
+    return list(_action(base_url, "package_list", session=session))
+
+def map_ckan_package(base_url: str, pkg: Dict[str, Any]) -> Dict[str, Any]:
     resources = pkg.get("resources",[])
     access_url = resources[0]["url"] if resources else ""
     fmt = (resources[0].get("format") or "").upper() if resources else ""
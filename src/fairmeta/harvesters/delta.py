@@ -0,0 +1,219 @@
+"""Incremental (delta) harvesting driven by per-source modification watermarks.
+
+Each source (a CKAN portal, or Zenodo optionally restricted to a community)
+keeps a high-water mark: the newest ``metadata_modified`` / ``updated`` value
+seen in its last successful sync. The next sync asks the source only for
+records modified at or after that mark, runs them through enrich and score,
+and stores them. The mark only advances once a sync completes, and the
+``>=`` bound means a record modified in the same instant as the previous mark
+is re-processed rather than missed; re-scoring is idempotent.
+
+Records removed at the source become tombstones in the catalogue. CKAN
+deletions are found by diffing ``package_list`` against the datasets seen so
+far; Zenodo deletions come from OAI-PMH ``status="deleted"`` headers.
+
+State lives in ``data/harvest_state.sqlite``. Usage::
+
+    python -m fairmeta.harvesters.delta ckan https://data.gov.ie
+    python -m fairmeta.harvesters.delta zenodo --community my-community
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import logging
+import sqlite3
+
+import requests
+
+from ..config import DATA_DIR, ensure_dir
+from ..enrich import enrich_record
+from ..fair_scoring import score_record
+from ..report import write_reports_many
+from ..catalogue import get_catalogue
+from ..dedup import get_index
+from . import ckan, zenodo
+
+logger = logging.getLogger(__name__)
+
+STATE_DB = DATA_DIR / "harvest_state.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    source    TEXT PRIMARY KEY,
+    watermark TEXT
+);
+CREATE TABLE IF NOT EXISTS seen (
+    source    TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    PRIMARY KEY (source, key)
+);
+"""
+
+
+class HarvestState:
+    """Watermarks and source-key → record_id mappings for delta harvests."""
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or STATE_DB)
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_dir(self.path.parent)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.executescript(_SCHEMA)
+        return con
+
+    def watermark(self, source: str) -> Optional[str]:
+        con = self._connect()
+        try:
+            row = con.execute("SELECT watermark FROM watermarks WHERE source = ?", (source,)).fetchone()
+        finally:
+            con.close()
+        return row[0] if row else None
+
+    def set_watermark(self, source: str, watermark: Optional[str]) -> None:
+        con = self._connect()
+        try:
+            with con:
+                con.execute("INSERT INTO watermarks VALUES (?, ?) ON CONFLICT(source) "
+                            "DO UPDATE SET watermark = excluded.watermark", (source, watermark))
+        finally:
+            con.close()
+
+    def remember(self, source: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        con = self._connect()
+        try:
+            with con:
+                con.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?, ?)",
+                                [(source, k, rid) for k, rid in pairs])
+        finally:
+            con.close()
+
+    def seen(self, source: str) -> Dict[str, str]:
+        con = self._connect()
+        try:
+            return dict(con.execute("SELECT key, record_id FROM seen WHERE source = ?", (source,)))
+        finally:
+            con.close()
+
+    def forget(self, source: str, keys: Iterable[str]) -> None:
+        con = self._connect()
+        try:
+            with con:
+                con.executemany("DELETE FROM seen WHERE source = ? AND key = ?", [(source, k) for k in keys])
+        finally:
+            con.close()
+
+
+def _process(records: List[Dict[str, Any]], profile: Optional[str], check_links: bool = False) -> None:
+    records = [enrich_record(rec) for rec in records]
+    if check_links:
+        from ..linkcheck import check_records
+        check_records(records)
+    items = [(rec, score_record(rec, profile)) for rec in records]
+    write_reports_many(items)
+
+
+def _sync(source: str, changed: Iterable[Tuple[str, str, Dict[str, Any]]],
+          state: HarvestState, profile: Optional[str], batch_size: int,
+          check_links: bool = False) -> Dict[str, Any]:
+    """Score ``(source_key, modified, record)`` triples in batches; return sync stats."""
+    since = state.watermark(source)
+    watermark, count = since, 0
+    batch: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def flush():
+        _process([rec for _, _, rec in batch], profile, check_links)
+        state.remember(source, [(key, rec["record_id"]) for key, _, rec in batch])
+
+    for key, modified, rec in changed:
+        batch.append((key, modified, rec))
+        count += 1
+        if modified and (watermark is None or modified > watermark):
+            watermark = modified
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    return {"source": source, "since": since, "changed": count, "watermark": watermark}
+
+
+def _tombstone(source: str, state: HarvestState, deleted_keys: Iterable[str]) -> int:
+    known = state.seen(source)
+    keys = [k for k in deleted_keys if k in known]
+    n = get_catalogue().mark_deleted(known[k] for k in keys)
+    get_index().remove(known[k] for k in keys)
+    state.forget(source, keys)
+    return n
+
+
+def sync_ckan(base_url: str, state: Optional[HarvestState] = None, profile: Optional[str] = None,
+              detect_deletions: bool = True, batch_size: int = 200, check_links: bool = False) -> Dict[str, Any]:
+    """Harvest CKAN datasets modified since the last sync of ``base_url``."""
+    state = state or HarvestState()
+    source = f"ckan:{base_url.rstrip('/')}"
+    session = requests.Session()
+    since = state.watermark(source)
+    changed = ((pkg.get("name") or pkg.get("id"), pkg.get("metadata_modified") or "",
+                ckan.map_ckan_package(base_url, pkg))
+               for pkg in ckan.iter_ckan_modified_since(base_url, since, session=session))
+    stats = _sync(source, changed, state, profile, batch_size, check_links)
+    stats["deleted"] = 0
+    if detect_deletions and since is not None:
+        live = set(ckan.list_ckan_dataset_names(base_url, session=session))
+        stats["deleted"] = _tombstone(source, state, [k for k in state.seen(source) if k not in live])
+    state.set_watermark(source, stats["watermark"])
+    return stats
+
+
+def sync_zenodo(community: Optional[str] = None, state: Optional[HarvestState] = None,
+                profile: Optional[str] = None, detect_deletions: bool = True,
+                batch_size: int = 200, check_links: bool = False) -> Dict[str, Any]:
+    """Harvest Zenodo records updated since the last sync (optionally one community)."""
+    state = state or HarvestState()
+    source = f"zenodo:{community or '*'}"
+    session = requests.Session()
+    since = state.watermark(source)
+    changed = ((str(obj.get("id")), obj.get("updated") or "", zenodo.map_zenodo_record(obj))
+               for obj in zenodo.iter_modified_since(since, community, session=session))
+    stats = _sync(source, changed, state, profile, batch_size, check_links)
+    stats["deleted"] = 0
+    if detect_deletions and since is not None:
+        stats["deleted"] = _tombstone(source, state, zenodo.iter_deleted_since(since, community, session=session))
+    state.set_watermark(source, stats["watermark"])
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m fairmeta.harvesters.delta",
+                                 description="Incremental harvest since the last watermark.")
+    sub = ap.add_subparsers(dest="source", required=True)
+    p = sub.add_parser("ckan")
+    p.add_argument("base_url")
+    p = sub.add_parser("zenodo")
+    p.add_argument("--community", default=None)
+    for p in sub.choices.values():
+        p.add_argument("--profile", default=None, help="Rule profile name or path")
+        p.add_argument("--no-deletions", action="store_true", help="Skip tombstone detection")
+        p.add_argument("--reset", action="store_true", help="Forget the watermark and do a full harvest")
+        p.add_argument("--check-links", action="store_true",
+                       help="Verify landing_page/access_url over HTTP (see the 'linkcheck' profile)")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    state = HarvestState()
+    source = f"ckan:{args.base_url.rstrip('/')}" if args.source == "ckan" else f"zenodo:{args.community or '*'}"
+    if args.reset:
+        state.set_watermark(source, None)
+    if args.source == "ckan":
+        stats = sync_ckan(args.base_url, state, args.profile, not args.no_deletions, check_links=args.check_links)
+    else:
+        stats = sync_zenodo(args.community, state, args.profile, not args.no_deletions, check_links=args.check_links)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 from __future__ import annotations
+import os
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
+import xml.etree.ElementTree as ET
 from ..ingest import normalize_record
 
-ZENODO_API = "https://zenodo.org/api/records"
+# overridable so tests and load tests can point at a local stand-in
+ZENODO_API = os.environ.get("FAIRMETA_ZENODO_API", "https://zenodo.org/api/records")
+ZENODO_OAI = os.environ.get("FAIRMETA_ZENODO_OAI", "https://zenodo.org/oai2d")
+_OAI_NS = {"oai": "http://www.openarchives.org/OAI/2.0/"}
 
-def _map_zenodo_to_internal(obj: Dict[str, Any]) -> Dict[str, Any]:
+def map_zenodo_record(obj: Dict[str, Any]) -> Dict[str, Any]:
     md = obj.get("metadata", {})
     creators = [{"name": c.get("name"), "orcid": c.get("orcid"), "email": c.get("affiliation")} for c in md.get("creators", [])]
     access_url = ""
@@ -36,7 +41,7 @@ def _map_zenodo_to_internal(obj: Dict[str, Any]) -> Dict[str, Any]:
 def fetch_by_record_id(record_id: int) -> Dict[str, Any]:
     r = requests.get(f"{ZENODO_API}/{record_id}", timeout=30)
     r.raise_for_status()
-    return _map_zenodo_to_internal(r.json())
+    return map_zenodo_record(r.json())
 
 def fetch_by_doi(doi: str) -> Dict[str, Any]:
     params = {"q": f'doi:"{doi}"'}
@@ -45,4 +50,40 @@ def fetch_by_doi(doi: str) -> Dict[str, Any]:
     hits = r.json().get("hits",{}).get("hits",[])
     if not hits:
         raise ValueError(f"Zenodo DOI not found: {doi}")
-    return _map_zenodo_to_internal(hits[0])
+    return map_zenodo_record(hits[0])
+
+def iter_modified_since(since: Optional[str], community: Optional[str] = None, size: int = 100,
+                        session=None) -> Iterator[Dict[str, Any]]:
+    """Yield raw Zenodo records with ``updated >= since`` (all if ``since`` is None)."""
+    params: Dict[str, Any] = {"size": size, "page": 1}
+    if since:
+        params["q"] = f'updated:["{since}" TO *]'
+    if community:
+        params["communities"] = community
+    while True:
+        r = (session or requests).get(ZENODO_API, params=params, timeout=30)
+        r.raise_for_status()
+        body = r.json()
+        hits = body.get("hits", {}).get("hits", [])
+        yield from hits
+        if not hits or not body.get("links", {}).get("next"):
+            break
+        params["page"] += 1
+
+def iter_deleted_since(since: str, community: Optional[str] = None, session=None) -> Iterator[str]:
+    """Yield Zenodo record ids deleted since ``since``, from OAI-PMH tombstone headers."""
+    params: Dict[str, Any] = {"verb": "ListIdentifiers", "metadataPrefix": "oai_dc", "from": since}
+    if community:
+        params["set"] = f"user-{community}"
+    while True:
+        r = (session or requests).get(ZENODO_OAI, params=params, timeout=60)
+        r.raise_for_status()
+        root = ET.fromstring(r.content)
+        for header in root.iterfind(".//oai:header", _OAI_NS):
+            if header.get("status") == "deleted":
+                ident = header.findtext("oai:identifier", default="", namespaces=_OAI_NS)
+                yield ident.rsplit(":", 1)[-1]
+        token = root.findtext(".//oai:resumptionToken", default="", namespaces=_OAI_NS).strip()
+        if not token:
+            break
+        params = {"verb": "ListIdentifiers", "resumptionToken": token}
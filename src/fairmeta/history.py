@@ -0,0 +1,489 @@
+"""Append-only, columnar log of scoring events for FAIRness trends over time.
+
+Reports and catalogue rows hold only the latest score. Every call to
+``write_reports_many`` also appends one event per record here:
+``(record_id, timestamp, F, A, I, R, total, check bitmask)``.
+
+Layout under ``config.HISTORY_DIR``:
+
+``ids.txt`` / ``checks.txt``
+    Append-only interning tables (one JSON string per line). Events refer to
+    records and to ``"<dim>.<check>"`` names by line number; bit *i* of the
+    check mask is set when check *i* passed.
+``log.bin``
+    Recent events as fixed-width rows. A record re-scored with exactly the
+    same scores and checks as its previous event is written as a short
+    *unchanged* row (id and timestamp only) - the common case for nightly
+    re-scoring, where most records do not move.
+``seg-NNNNNN.bin``
+    Compacted segments: the log rewritten column by column (ids, timestamps,
+    changed flags, then score and mask columns for changed rows only), sorted
+    by record id and zlib-compressed. Per-record trends bisect the id column
+    instead of scanning.
+``head.bin`` / ``manifest.json``
+    Latest state per record at the last compaction, and the segment list.
+
+Writers from several processes serialise on ``history.lock`` (``flock``) and
+catch up on each other's log rows before appending, so *unchanged* rows are
+always relative to the true previous event. Scores are stored as integer
+thousandths, which is exact for the 3-decimal scores ``score_record`` emits.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+
+try:  # POSIX only; elsewhere the in-process lock still serialises threads
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+DIMS = ("F", "A", "I", "R", "total")
+MAX_CHECKS = 64
+FULL = struct.Struct("<BIqHHHHHQ")   # kind=1, id, ts_ms, F, A, I, R, total, mask
+SAME = struct.Struct("<BIq")         # kind=0, id, ts_ms
+SEG_MAGIC = b"FMH1"
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+State = Tuple[int, int, int, int, int, int]   # F, A, I, R, total (thousandths), mask
+Event = Tuple[int, int, Optional[State]]      # id, ts_ms, state (None = unchanged)
+
+
+def _milli(x: Any) -> int:
+    return max(0, min(65535, int(round(float(x or 0) * 1000))))
+
+
+def _parse_log(buf: bytes) -> Tuple[List[Event], int]:
+    """Decode log rows; returns events and the number of bytes consumed."""
+    events: List[Event] = []
+    pos, n = 0, len(buf)
+    while pos < n:
+        if buf[pos] == 1:
+            if pos + FULL.size > n:
+                break
+            _, i, ts, *state = FULL.unpack_from(buf, pos)
+            events.append((i, ts, tuple(state)))
+            pos += FULL.size
+        else:
+            if pos + SAME.size > n:
+                break
+            _, i, ts = SAME.unpack_from(buf, pos)
+            events.append((i, ts, None))
+            pos += SAME.size
+    return events, pos
+
+
+def _pack_columns(columns: Dict[str, array], header: Dict[str, Any]) -> bytes:
+    blobs, offsets, pos = [], {}, 0
+    for name, col in columns.items():
+        blob = zlib.compress(col.tobytes(), 6)
+        offsets[name] = [pos, len(blob), col.typecode]
+        blobs.append(blob)
+        pos += len(blob)
+    head = json.dumps(dict(header, columns=offsets, byteorder=sys.byteorder)).encode("utf-8")
+    return SEG_MAGIC + struct.pack("<I", len(head)) + head + b"".join(blobs)
+
+
+def _unpack_columns(data: bytes) -> Tuple[Dict[str, Any], Dict[str, array]]:
+    if data[:4] != SEG_MAGIC:
+        raise ValueError("Not a score history segment")
+    (hlen,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + hlen])
+    base, cols = 8 + hlen, {}
+    for name, (off, length, typecode) in header["columns"].items():
+        col = array(typecode)
+        col.frombytes(zlib.decompress(data[base + off:base + off + length]))
+        if header["byteorder"] != sys.byteorder:
+            col.byteswap()
+        cols[name] = col
+    return header, cols
+
+
+class Segment:
+    """A decoded compacted segment, sorted by record id."""
+    def __init__(self, path: Path):
+        self.header, cols = _unpack_columns(path.read_bytes())
+        self.ids, self.ts, self.changed = cols["id"], cols["ts"], cols["changed"]
+        self.values = [cols[d] for d in DIMS] + [cols["mask"]]
+        # rank[k] = number of changed rows before row k (index into value columns)
+        self.rank = array("I", accumulate(self.changed, initial=0))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def state(self, k: int) -> Optional[State]:
+        if not self.changed[k]:
+            return None
+        j = self.rank[k]
+        return tuple(col[j] for col in self.values)
+
+    def events(self, lo: int = 0, hi: Optional[int] = None) -> List[Event]:
+        hi = len(self) if hi is None else hi
+        return [(self.ids[k], self.ts[k], self.state(k)) for k in range(lo, hi)]
+
+    def events_for(self, i: int) -> List[Event]:
+        return self.events(bisect_left(self.ids, i), bisect_right(self.ids, i))
+
+
+@lru_cache(maxsize=8)
+def _load_segment(path: str, mtime_ns: int) -> Segment:
+    return Segment(Path(path))
+
+
+def _iso(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000, timezone.utc).isoformat(timespec="seconds")
+
+
+class _Series:
+    """Running state behind :meth:`ScoreHistory.timeseries`.
+
+    ``closed`` holds the rows of finished buckets; the open bucket is kept as
+    running sums so later events can extend it. A series created with a
+    ``parent`` reads the parent's per-record states and overlays its own, so
+    folding the log onto the cached fold of the segments costs only the log.
+    """
+    def __init__(self, width: int, parent: Optional["_Series"] = None):
+        self.width, self.parent = width, parent
+        self.current: Dict[int, State] = {}
+        self.closed: List[Dict[str, Any]] = []
+        self.sums = list(parent.sums) if parent else [0] * 5
+        self.records = parent.records if parent else 0
+        self.edge: Optional[int] = parent.edge if parent else None
+        self.n_events = parent.n_events if parent else 0
+        self.ts_max: Optional[int] = parent.ts_max if parent else None
+
+    def fold(self, events: List[Event]) -> bool:
+        """Apply ``events`` in timestamp order.
+
+        Returns False, without applying anything, when an event predates what
+        was already folded; the caller must then rebuild from scratch.
+        """
+        events = sorted(events, key=lambda e: e[1])
+        if events and self.ts_max is not None and events[0][1] < self.ts_max:
+            return False
+        parent = self.parent.current if self.parent else {}
+        for i, ts, s in events:
+            b = ts - ts % self.width
+            if self.edge is not None and b != self.edge:
+                self.closed.append(self._row())
+                self.n_events = 0
+            self.edge, self.ts_max = b, ts
+            self.n_events += 1
+            if s is None:
+                continue
+            old = self.current.get(i) or parent.get(i)
+            if old is None:
+                self.records += 1
+            for j in range(5):
+                self.sums[j] += s[j] - (old[j] if old else 0)
+            self.current[i] = s
+        return True
+
+    def _row(self) -> Dict[str, Any]:
+        n = self.records
+        row = {"bucket": _iso(self.edge), "records": n, "events": self.n_events}
+        row.update({d: round(self.sums[k] / n / 1000, 4) if n else 0.0 for k, d in enumerate(DIMS)})
+        return row
+
+    def rows(self) -> List[Dict[str, Any]]:
+        out = (self.parent.closed if self.parent else []) + self.closed
+        return out + [self._row()] if self.edge is not None else out
+
+
+class ScoreHistory:
+    """Append-only score history rooted at ``directory``."""
+    def __init__(self, directory: Optional[Path] = None, compact_rows: Optional[int] = None):
+        self.dir = Path(directory or config.HISTORY_DIR)
+        self.compact_rows = compact_rows or config.HISTORY_COMPACT_ROWS
+        self._thread_lock = threading.Lock()
+        self._series: Dict[str, Tuple[Tuple[str, ...], _Series]] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.generation: Optional[int] = None
+        self.segments: List[str] = []
+        self.ids: List[str] = []
+        self.checks: List[str] = []
+        self._index: Dict[str, Dict[str, int]] = {"ids.txt": {}, "checks.txt": {}}
+        self._names_offset = {"ids.txt": 0, "checks.txt": 0}
+        self.head: Dict[int, State] = {}
+        self._offset = 0
+        self._log_rows = 0
+
+    # --- files and locking ---------------------------------------------------
+    @contextmanager
+    def _locked(self):
+        config.ensure_dir(self.dir)
+        with self._thread_lock, open(self.dir / "history.lock", "a+") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.dir / "manifest.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"generation": 0, "segments": [], "log_start": 0}
+
+    def _write_atomic(self, name: str, data: bytes) -> None:
+        tmp = self.dir / f".{name}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, self.dir / name)
+
+    def _names(self, name: str) -> List[str]:
+        return self.ids if name == "ids.txt" else self.checks
+
+    def _read_names(self, name: str) -> None:
+        path = self.dir / name
+        if not path.exists():
+            return
+        with open(path, "rb") as fh:
+            fh.seek(self._names_offset[name])
+            data = fh.read()
+        end = data.rfind(b"\n") + 1
+        names, index = self._names(name), self._index[name]
+        for line in data[:end].splitlines():
+            value = json.loads(line)
+            index[value] = len(names)
+            names.append(value)
+        self._names_offset[name] += end
+
+    def _intern(self, name: str, value: str, pending: List[str]) -> int:
+        index = self._index[name]
+        i = index.get(value)
+        if i is None:
+            names = self._names(name)
+            i = index[value] = len(names)
+            names.append(value)
+            pending.append(value)
+        return i
+
+    def _append_names(self, name: str, values: List[str]) -> None:
+        if values:
+            data = "".join(json.dumps(v, ensure_ascii=False) + "\n" for v in values).encode("utf-8")
+            with open(self.dir / name, "ab") as fh:
+                fh.write(data)
+            self._names_offset[name] += len(data)
+
+    def _read_head(self) -> Dict[int, State]:
+        path = self.dir / "head.bin"
+        if not path.exists():
+            return {}
+        _, cols = _unpack_columns(path.read_bytes())
+        values = [cols[d] for d in DIMS] + [cols["mask"]]
+        return {i: tuple(col[k] for col in values) for k, i in enumerate(cols["id"])}
+
+    def _sync(self) -> None:
+        """Catch up with other writers (call with the lock held)."""
+        manifest = self._manifest()
+        if manifest["generation"] != self.generation:
+            self._reset()
+            self.generation, self.segments = manifest["generation"], list(manifest["segments"])
+            self.head = self._read_head()
+            self._offset = manifest.get("log_start", 0)
+        self._read_names("ids.txt")
+        self._read_names("checks.txt")
+        log = self.dir / "log.bin"
+        if log.exists():
+            with open(log, "rb") as fh:
+                fh.seek(self._offset)
+                events, used = _parse_log(fh.read())
+            for i, _, state in events:
+                if state is not None:
+                    self.head[i] = state
+            self._offset += used
+            self._log_rows += len(events)
+
+    # --- writing -------------------------------------------------------------
+    def record_many(self, items: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]],
+                    ts: Optional[float] = None) -> int:
+        """Append one event per ``(record, scoring)`` pair; returns the count."""
+        items = list(items)
+        if not items:
+            return 0
+        ts_ms = int((time.time() if ts is None else ts) * 1000)
+        with self._locked():
+            self._sync()
+            new_ids: List[str] = []
+            new_checks: List[str] = []
+            out = bytearray()
+            for rec, scoring in items:
+                i = self._intern("ids.txt", str(rec.get("record_id") or "unknown"), new_ids)
+                scores = scoring.get("scores") or {}
+                mask = 0
+                for dim, checks in (scoring.get("checks") or {}).items():
+                    for check, ok in checks.items():
+                        bit = self._intern("checks.txt", f"{dim}.{check}", new_checks)
+                        if ok and bit < MAX_CHECKS:
+                            mask |= 1 << bit
+                state = tuple(_milli(scores.get(d)) for d in DIMS) + (mask,)
+                if self.head.get(i) == state:
+                    out += SAME.pack(0, i, ts_ms)
+                else:
+                    out += FULL.pack(1, i, ts_ms, *state)
+                    self.head[i] = state
+            if len(self.checks) > MAX_CHECKS and new_checks:
+                logger.warning("Score history tracks at most %d distinct checks; extra checks are not "
+                               "recorded in the bitmask", MAX_CHECKS)
+            # names first, so a reader never sees an event it cannot resolve
+            self._append_names("ids.txt", new_ids)
+            self._append_names("checks.txt", new_checks)
+            with open(self.dir / "log.bin", "ab") as fh:
+                fh.write(out)
+            self._offset += len(out)
+            self._log_rows += len(items)
+            if self._log_rows >= self.compact_rows:
+                self._compact()
+        return len(items)
+
+    def compact(self) -> int:
+        """Fold the log into a new columnar segment; returns rows compacted."""
+        with self._locked():
+            self._sync()
+            return self._compact()
+
+    def _compact(self) -> int:
+        manifest = self._manifest()
+        log = self.dir / "log.bin"
+        start = manifest.get("log_start", 0)
+        data = log.read_bytes()[start:] if log.exists() else b""
+        events, _ = _parse_log(data)
+        if not events:
+            return 0
+        events.sort(key=lambda e: e[0])  # stable: keeps append order per record
+        changed = [e[2] for e in events if e[2] is not None]
+        columns = {
+            "id": array("I", (e[0] for e in events)),
+            "ts": array("q", (e[1] for e in events)),
+            "changed": array("B", (e[2] is not None for e in events)),
+        }
+        for k, d in enumerate(DIMS):
+            columns[d] = array("H", (s[k] for s in changed))
+        columns["mask"] = array("Q", (s[5] for s in changed))
+        generation = manifest["generation"] + 1
+        name = f"seg-{generation:06d}.bin"
+        ts_col = columns["ts"]
+        self._write_atomic(name, _pack_columns(columns, {
+            "rows": len(events), "changed": len(changed), "ts_min": min(ts_col), "ts_max": max(ts_col)}))
+
+        head_ids = sorted(self.head)
+        head_cols = {"id": array("I", head_ids)}
+        for k, d in enumerate(DIMS):
+            head_cols[d] = array("H", (self.head[i][k] for i in head_ids))
+        head_cols["mask"] = array("Q", (self.head[i][5] for i in head_ids))
+        self._write_atomic("head.bin", _pack_columns(head_cols, {"rows": len(head_ids)}))
+
+        # Rows before log_start are already in segments; if we crash before the
+        # truncate below, the next sync simply skips them.
+        segments = manifest["segments"] + [name]
+        self._write_atomic("manifest.json", json.dumps(
+            {"generation": generation, "segments": segments, "log_start": start + len(data)}).encode("utf-8"))
+        log.write_bytes(b"")
+        self._write_atomic("manifest.json", json.dumps(
+            {"generation": generation, "segments": segments, "log_start": 0}).encode("utf-8"))
+        self.generation, self.segments = generation, segments
+        self._offset, self._log_rows = 0, 0
+        logger.info("Compacted %d history rows into %s", len(events), name)
+        return len(events)
+
+    # --- reading -------------------------------------------------------------
+    def _snapshot(self) -> Tuple[Tuple[str, ...], List[Event]]:
+        """Segment names and uncompacted log events, read consistently under the lock."""
+        if not self.dir.exists():  # nothing recorded yet; reads do not create the directory
+            return (), []
+        with self._locked():
+            self._sync()
+            names = tuple(self.segments)
+            start = self._manifest().get("log_start", 0)
+            log = self.dir / "log.bin"
+            events, _ = _parse_log(log.read_bytes()[start:]) if log.exists() else ([], 0)
+        return names, events
+
+    def _segments(self, names: Iterable[str]) -> List[Segment]:
+        # segment files are immutable once listed in the manifest, so no lock is needed
+        out = []
+        for name in names:
+            path = self.dir / name
+            out.append(_load_segment(str(path), path.stat().st_mtime_ns))
+        return out
+
+    def _as_dict(self, ts: int, state: State) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"ts": datetime.fromtimestamp(ts / 1000, timezone.utc).isoformat(timespec="seconds")}
+        out.update({d: state[k] / 1000 for k, d in enumerate(DIMS)})
+        out["passed"] = [c for b, c in enumerate(self.checks[:MAX_CHECKS]) if state[5] >> b & 1]
+        return out
+
+    def trend(self, record_id: str) -> List[Dict[str, Any]]:
+        """Every scoring event for ``record_id``, oldest first."""
+        names, log_events = self._snapshot()
+        segments = self._segments(names)
+        i = self._index["ids.txt"].get(record_id)
+        if i is None:
+            return []
+        events = [e for seg in segments for e in seg.events_for(i)]
+        events += [e for e in log_events if e[0] == i]
+        out, state = [], None
+        for _, ts, s in events:
+            state = s or state
+            if state is not None:
+                out.append(dict(self._as_dict(ts, state), changed=s is not None))
+        return out
+
+    def timeseries(self, bucket: str = "day") -> List[Dict[str, Any]]:
+        """Catalogue-wide mean scores at the end of each time bucket.
+
+        Each record contributes its latest score as of the bucket's end, so
+        the series shows how the catalogue as a whole improves over time.
+        The fold over compacted segments is cached until the next compaction;
+        each call then only folds the log (at most ``compact_rows`` events).
+        """
+        width = BUCKETS[bucket] * 1000
+        names, log_events = self._snapshot()
+        cached = self._series.get(bucket)
+        if cached is None or cached[0] != names:
+            base = _Series(width)
+            base.fold([e for seg in self._segments(names) for e in seg.events()])
+            self._series[bucket] = cached = (names, base)
+        series = _Series(width, cached[1])
+        if not series.fold(log_events):  # back-dated log events: rebuild from everything
+            series = _Series(width)
+            series.fold([e for seg in self._segments(names) for e in seg.events()] + log_events)
+        return series.rows()
+
+    def stats(self) -> Dict[str, Any]:
+        names, log_events = self._snapshot()
+        segments = self._segments(names)
+        return {"records": len(self.ids), "checks": len(self.checks), "segments": len(segments),
+                "segment_rows": sum(len(s) for s in segments), "log_rows": len(log_events)}
+
+
+_DEFAULT: Optional[ScoreHistory] = None
+
+
+def get_history() -> ScoreHistory:
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = ScoreHistory()
+    return _DEFAULT
@@ -0,0 +1,99 @@
+"""Single-pass extraction of DOIs, handles, URLs, ORCIDs and e-mail addresses.
+
+``enrich_record`` used to run one ``findall`` per identifier type over the
+whole text, although most descriptions contain no identifier at all. None of
+the patterns can match across whitespace, so every match lies inside one
+whitespace-delimited token. Extraction therefore works in three steps:
+
+1. cheap substring checks on the whole text (``/``, ``@``, ``-``); when none
+   is present nothing can match and the text is not scanned at all;
+2. one combined scan that picks out the candidate tokens: those containing
+   ``/`` or ``@``, or shaped like an ORCID;
+3. per candidate token, further substring checks (``10.``, ``://``, ``@``,
+   ``/``) decide which pattern to apply, so each pattern only ever runs on
+   the few tokens that might match it.
+
+Because the per-type patterns are applied to every token they could match,
+the results equal running each pattern over the whole text. DOIs are then
+normalised (trailing sentence punctuation and unbalanced closing brackets
+removed), and ORCIDs are validated with their ISO 7064 checksum.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+import re
+
+DOI_RX = re.compile(r"(10\.\d{4,9}/[-._;()/:A-Za-z0-9]+)")
+HANDLE_RX = re.compile(r"(?:hdl:)?\d{4,5}/[A-Za-z0-9.\-_/]+")
+URL_RX = re.compile(r"https?://[^\s]+")
+EMAIL_RX = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+ORCID_RX = re.compile(r"(?<![\dA-Za-z])(\d{4}-\d{4}-\d{4}-\d{3}[\dX])(?![\dA-Za-z])")
+# one pass over the text: whole tokens that contain / or @, or an ORCID-shaped run
+CANDIDATE_RX = re.compile(r"(?<!\S)\S*(?:[/@]|\d{4}-\d{4}-\d{4}-\d{3}[\dX])\S*")
+
+KINDS = ("dois", "handles", "urls", "emails", "orcids")
+_DOI_TRAILING = ".,;:"
+
+
+def normalize_doi(doi: str) -> str:
+    """Strip sentence punctuation and unbalanced closing brackets from a DOI's end."""
+    while doi:
+        if doi[-1] in _DOI_TRAILING:
+            doi = doi[:-1]
+        elif doi[-1] == ")" and doi.count(")") > doi.count("("):
+            doi = doi[:-1]
+        else:
+            break
+    return doi
+
+
+def orcid_valid(orcid: str) -> bool:
+    """ISO 7064 mod 11-2 check digit of a ``0000-0000-0000-000X`` ORCID."""
+    digits = orcid.replace("-", "")
+    total = 0
+    for ch in digits[:-1]:
+        total = (total + int(ch)) * 2
+    check = (12 - total % 11) % 11
+    return digits[-1] == ("X" if check == 10 else str(check))
+
+
+def _empty() -> Dict[str, List[str]]:
+    return {k: [] for k in KINDS}
+
+
+def extract(text: str, out: Dict[str, List[str]] = None) -> Dict[str, List[str]]:
+    """Identifiers in ``text``, in order of appearance (duplicates kept).
+
+    ``out`` may be an existing result to append to.
+    """
+    out = out if out is not None else _empty()
+    if not text or ("/" not in text and "@" not in text and "-" not in text):
+        return out
+    for m in CANDIDATE_RX.finditer(text):
+        tok = m.group()
+        if "/" in tok:
+            if "10." in tok:
+                out["dois"].extend(normalize_doi(d) for d in DOI_RX.findall(tok))
+            out["handles"].extend(HANDLE_RX.findall(tok))
+            if "://" in tok:
+                out["urls"].extend(URL_RX.findall(tok))
+        if "@" in tok:
+            out["emails"].extend(EMAIL_RX.findall(tok))
+        if "-" in tok:
+            out["orcids"].extend(o for o in ORCID_RX.findall(tok) if orcid_valid(o))
+    return out
+
+
+def extract_urls(values: Iterable[Any]) -> List[str]:
+    """URLs in short fields such as ``landing_page`` / ``access_url``."""
+    urls: List[str] = []
+    for v in values:
+        if v and "://" in v:
+            urls.extend(URL_RX.findall(v))
+    return urls
+
+
+def extract_dois(value: Any) -> List[str]:
+    if not value or "10." not in value:
+        return []
+    return [normalize_doi(d) for d in DOI_RX.findall(value)]
@@ -6,21 +6,22 @@ framework can integrate with KGs as described in the report.
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
-try:
-    import rdflib  # type: ignore
-    from rdflib import Graph, Namespace, URIRef, Literal  # type: ignore
-except Exception:
-    rdflib = None  # type: ignore
-    Graph = None   # type: ignore
-    Namespace = None  # type: ignore
-    URIRef = None  # type: ignore
-    Literal = None  # type: ignore
-    logger.info("rdflib not installed; KG construction disabled.")
+
+@lru_cache(maxsize=None)
+def _get_rdflib():
+    """Import rdflib on first use; ``None`` when it is not installed."""
+    try:
+        import rdflib  # type: ignore
+        return rdflib
+    except Exception:
+        logger.info("rdflib not installed; KG construction disabled.")
+        return None
 
 
 def build_kg(records: Iterable[Dict[str, Any]]):
@@ -29,8 +30,10 @@ def build_kg(records: Iterable[Dict[str, Any]]):
     Each record is expected to follow the internal normalised schema used by
     `fairmeta.ingest.normalize_record`.
     """
-    if Graph is None or Namespace is None:
+    rdflib = _get_rdflib()
+    if rdflib is None:
         return None
+    Graph, Namespace, URIRef, Literal = rdflib.Graph, rdflib.Namespace, rdflib.URIRef, rdflib.Literal
 
     g = Graph()
     EX = Namespace("http://example.org/dataset/")
@@ -73,7 +76,7 @@ def export_kg_turtle(graph, path: str):
 
     If rdflib is missing, this becomes a no-op so callers do not fail.
     """
-    if graph is None or rdflib is None:
+    if graph is None or _get_rdflib() is None:
         logger.warning("No graph available; skipping KG export.")
         return
     try:
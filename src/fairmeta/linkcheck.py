@@ -0,0 +1,242 @@
+"""Asynchronous bulk verification of ``landing_page`` and ``access_url`` links.
+
+The default profile only asks that these fields are non-empty, so dead links
+pass. This module checks them over HTTP without making catalogue runs crawl:
+
+- every distinct URL is checked once, concurrently, through one shared
+  ``httpx.AsyncClient`` (keep-alive connections are reused per host);
+- a semaphore per host caps parallel requests to any single server
+  (``config.LINKCHECK_PER_HOST``) and a global one caps the total;
+- a ``HEAD`` request is tried first, falling back to a streamed ``GET`` (the
+  body is never read) when the server rejects or mishandles ``HEAD``;
+- results are kept in ``data/linkcheck.sqlite`` for ``config.LINKCHECK_TTL``
+  seconds, so each URL is fetched at most once per period.
+
+:func:`check_records` stores the outcome under ``enrichment.links`` keyed by
+URL, where the ``resolvable`` rule predicate reads it (see the ``linkcheck``
+profile). Usage::
+
+    python -m fairmeta.linkcheck https://doi.org/10.5281/zenodo.1 https://example.org/x
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+LINK_FIELDS = ("landing_page", "access_url")
+# HEAD answers that say more about the server than about the resource
+HEAD_FALLBACK_STATUS = {400, 403, 404, 405, 406, 500, 501, 502, 503}
+USER_AGENT = "fairmeta-linkcheck/1.0"
+
+
+class LinkCache:
+    """TTL cache of link results in a SQLite file shared between processes."""
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS links (
+        url     TEXT PRIMARY KEY,
+        ok      INTEGER NOT NULL,
+        status  INTEGER,
+        error   TEXT,
+        checked REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None):
+        self.path = Path(path or config.LINKCHECK_DB)
+        self.ttl = config.LINKCHECK_TTL if ttl is None else ttl
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        config.ensure_dir(self.path.parent)
+        con = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(self._SCHEMA)
+            self._ready = True
+        return con
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Fresh cached results for ``urls``; expired or unknown URLs are absent."""
+        urls = list(urls)
+        if not urls:
+            return {}
+        cutoff = time.time() - self.ttl
+        out: Dict[str, Dict[str, Any]] = {}
+        con = self._connect()
+        try:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = con.execute(
+                    f"SELECT url, ok, status, error, checked FROM links WHERE checked >= ? "
+                    f"AND url IN ({','.join('?' * len(chunk))})", [cutoff, *chunk])
+                for url, ok, status, error, checked in rows:
+                    out[url] = _result(bool(ok), status, error, checked)
+        finally:
+            con.close()
+        return out
+
+    def put_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        con = self._connect()
+        try:
+            with con:
+                con.executemany("INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?)",
+                                [(url, int(r["ok"]), r["status"], r["error"], r["checked"])
+                                 for url, r in results.items()])
+        finally:
+            con.close()
+
+    def purge(self) -> int:
+        """Delete expired entries; return how many were removed."""
+        con = self._connect()
+        try:
+            with con:
+                return con.execute("DELETE FROM links WHERE checked < ?", (time.time() - self.ttl,)).rowcount
+        finally:
+            con.close()
+
+
+def _malformed(url: str) -> Optional[str]:
+    """Why an ``http(s)`` URL cannot be requested at all, or ``None``."""
+    try:
+        parts = urlsplit(url)
+        parts.port  # ValueError when out of range
+    except ValueError as exc:
+        return f"InvalidURL: {exc}"
+    return None if parts.hostname else "InvalidURL: no host"
+
+
+def _result(ok: bool, status: Optional[int], error: Optional[str], checked: float) -> Dict[str, Any]:
+    return {"ok": ok, "status": status, "error": error, "checked": checked,
+            "checked_at": datetime.fromtimestamp(checked, timezone.utc).isoformat(timespec="seconds")}
+
+
+class LinkChecker:
+    """Check many URLs concurrently with per-host limits and a result cache.
+
+    Parameters
+    ----------
+    per_host:
+        Maximum concurrent requests to one host.
+    concurrency:
+        Maximum concurrent requests overall (also the connection pool size).
+    timeout:
+        Per-request timeout in seconds.
+    cache:
+        A :class:`LinkCache`, or ``None`` to always fetch.
+    transport:
+        Optional ``httpx`` transport, e.g. ``httpx.MockTransport`` in tests.
+    """
+    def __init__(self, per_host: Optional[int] = None, concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, cache: Optional[LinkCache] = None, transport: Any = None):
+        self.per_host = max(1, per_host or config.LINKCHECK_PER_HOST)
+        self.concurrency = max(1, concurrency or config.LINKCHECK_CONCURRENCY)
+        self.timeout = timeout or config.LINKCHECK_TIMEOUT
+        self.cache = cache
+        self.transport = transport
+        self.stats = {"cached": 0, "fetched": 0, "head_fallbacks": 0, "failed": 0}
+
+    async def _probe(self, client, url: str) -> Dict[str, Any]:
+        import httpx
+
+        try:
+            try:
+                resp = await client.head(url)
+                status = resp.status_code
+            except (httpx.RemoteProtocolError, httpx.ReadError):
+                status = None
+            if status is None or status in HEAD_FALLBACK_STATUS:
+                self.stats["head_fallbacks"] += 1
+                async with client.stream("GET", url) as resp:
+                    status = resp.status_code
+            return _result(status < 400, status, None, time.time())
+        except (httpx.HTTPError, httpx.InvalidURL, ValueError) as exc:
+            self.stats["failed"] += 1
+            return _result(False, None, f"{type(exc).__name__}: {exc}"[:200], time.time())
+
+    async def check_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return ``{url: result}`` for every distinct ``http(s)`` URL in ``urls``.
+
+        Malformed URLs (bad port, unbalanced brackets, no host) are reported as
+        failed with the parse error instead of being requested.
+        """
+        import httpx
+
+        wanted = list(dict.fromkeys(u for u in urls if u and u[:8].lower().startswith(("http://", "https://"))))
+        results = self.cache.get_many(wanted) if self.cache is not None else {}
+        self.stats["cached"] += len(results)
+        todo = [u for u in wanted if u not in results]
+        if not todo:
+            return results
+
+        now = time.time()
+        fetched: Dict[str, Dict[str, Any]] = {u: _result(False, None, err, now)
+                                              for u in todo if (err := _malformed(u))}
+        self.stats["failed"] += len(fetched)
+        todo = [u for u in todo if u not in fetched]
+        overall = asyncio.Semaphore(self.concurrency)
+        hosts: Dict[str, asyncio.Semaphore] = {}
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout, limits=limits,
+                                     headers={"User-Agent": USER_AGENT}, transport=self.transport) as client:
+            async def one(url: str) -> None:
+                host = hosts.setdefault(urlsplit(url).netloc.lower(), asyncio.Semaphore(self.per_host))
+                async with host, overall:
+                    fetched[url] = await self._probe(client, url)
+            await asyncio.gather(*(one(u) for u in todo))
+
+        self.stats["fetched"] += len(fetched)
+        if self.cache is not None:
+            self.cache.put_many(fetched)
+        results.update(fetched)
+        return results
+
+
+async def check_records_async(records: List[Dict[str, Any]], checker: Optional[LinkChecker] = None,
+                              fields: Iterable[str] = LINK_FIELDS) -> List[Dict[str, Any]]:
+    """Check the link fields of ``records`` and store results in ``enrichment.links``."""
+    checker = checker or LinkChecker(cache=LinkCache())
+    fields = tuple(fields)
+    urls = [str(rec.get(f) or "").strip() for rec in records for f in fields]
+    results = await checker.check_many(urls)
+    for rec in records:
+        links = {}
+        for f in fields:
+            url = str(rec.get(f) or "").strip()
+            if url in results:
+                r = results[url]
+                links[url] = {"ok": r["ok"], "status": r["status"], "checked_at": r["checked_at"]}
+        rec.setdefault("enrichment", {})["links"] = links
+    return records
+
+
+def check_records(records: List[Dict[str, Any]], checker: Optional[LinkChecker] = None,
+                  fields: Iterable[str] = LINK_FIELDS) -> List[Dict[str, Any]]:
+    """Synchronous wrapper around :func:`check_records_async`."""
+    return asyncio.run(check_records_async(records, checker, fields))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m fairmeta.linkcheck", description="Check URLs concurrently.")
+    ap.add_argument("urls", nargs="+")
+    ap.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args(argv)
+    checker = LinkChecker(cache=None if args.no_cache else LinkCache())
+    results = asyncio.run(checker.check_many(args.urls))
+    print(json.dumps({"results": results, "stats": checker.stats}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,86 @@ filtering models later without breaking the UI.
 """
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
 import logging
+import os
 
-import pandas as pd
+from .text_features import analyze, build_features
 
 logger = logging.getLogger(__name__)
 
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
-    from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
-except Exception:
-    TfidfVectorizer = None  # type: ignore
-    cosine_similarity = None  # type: ignore
-    logger.info("scikit-learn not installed; recommendation disabled.")
+
+@lru_cache(maxsize=None)
+def _get_sklearn():
+    """Import scikit-learn on first use; ``(None, None)`` when unavailable."""
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+        from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
+        return TfidfVectorizer, cosine_similarity
+    except Exception:
+        logger.info("scikit-learn not installed; recommendation disabled.")
+        return None, None
+
+
+@lru_cache(maxsize=None)
+def _get_hashing():
+    """``(HashingVectorizer, TfidfTransformer, Pipeline)`` or ``(None, None, None)``."""
+    try:
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer  # type: ignore
+        from sklearn.pipeline import Pipeline  # type: ignore
+        return HashingVectorizer, TfidfTransformer, Pipeline
+    except Exception:
+        logger.info("scikit-learn not installed; recommendation disabled.")
+        return None, None, None
+
+
+N_FEATURES = 2 ** 20
+KEEP_FIELDS = ("record_id", "title", "identifier", "keywords")
+
+
+def _hashing_vectorizer(n_features: int):
+    HashingVectorizer = _get_hashing()[0]
+    return HashingVectorizer(n_features=n_features, analyzer=list, alternate_sign=False, norm=None)
+
+
+def _record_terms(rec: Dict[str, Any], feats) -> List[str]:
+    topics = (rec.get("advanced_enrichment") or {}).get("topics") or []
+    return [*feats.blob_terms, *analyze(" ".join(topics))]
+
+
+def _build_chunk(rows: List[Dict[str, Any]], advanced: bool, n_features: int,
+                 keep: Sequence[str]) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Worker: normalise, enrich and hash one chunk of raw rows.
+
+    Returns the chunk's term-count matrix (``None`` without scikit-learn) and
+    the records reduced to ``keep``.
+    """
+    from .enrich import enrich_record
+    from .ingest import normalize_record
+
+    recs = [enrich_record(normalize_record(r)) for r in rows]
+    if advanced:
+        from .advanced_nlp import enrich_text_advanced_batch
+        extra = enrich_text_advanced_batch([{"title": r.get("title", ""), "description": r.get("description", "")}
+                                            for r in recs])
+        for rec, adv in zip(recs, extra):
+            rec["advanced_enrichment"] = adv
+    matrix = None
+    if _get_hashing()[0] is not None:
+        docs = [_record_terms(rec, f) for rec, f in zip(recs, build_features(recs, fields=("blob_terms",)))]
+        matrix = _hashing_vectorizer(n_features).transform(docs)
+    return matrix, [{k: rec.get(k) for k in keep} for rec in recs]
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
 
 
 class HybridRecommender:
@@ -32,33 +98,97 @@ class HybridRecommender:
         Sequence of normalised/enriched metadata dicts.
     """
     def __init__(self, records: List[Dict[str, Any]]):
+        import pandas as pd
+
         self.records = records
         self.df = pd.DataFrame(records)
         self.df.index = range(len(self.df))
         self.vectorizer = None
         self.item_matrix = None
 
-    def _combined_text(self) -> List[str]:
-        def to_text(row):
-            parts = [
-                str(row.get("title") or ""),
-                str(row.get("description") or ""),
-                " ".join(row.get("keywords") or []),
-            ]
-            adv = row.get("advanced_enrichment") or {}
-            topics = adv.get("topics") or []
-            parts.append(" ".join(topics))
-            return " ".join(p for p in parts if p)
-        return [to_text(r) for _, r in self.df.iterrows()]
+    def _combined_terms(self) -> List[List[str]]:
+        """Analysed terms per record: cached text features plus topic labels."""
+        return [_record_terms(rec, feats)
+                for rec, feats in zip(self.records, build_features(self.records, fields=("blob_terms",)))]
+
+    @classmethod
+    def from_source(cls, source: Union[str, Path, Iterable[Dict[str, Any]]], n_jobs: Optional[int] = None,
+                    chunk_size: int = 1000, advanced: bool = True, n_features: int = N_FEATURES,
+                    keep: Sequence[str] = KEEP_FIELDS) -> "HybridRecommender":
+        """Build a fitted recommender from raw rows, enriching them in parallel.
+
+        Parameters
+        ----------
+        source:
+            A CSV or JSON-lines path, or an iterable of raw metadata dicts. It is
+            read lazily, in chunks of ``chunk_size`` rows.
+        n_jobs:
+            Worker processes for normalise → enrich → (advanced enrich) → hash;
+            defaults to all cores, ``1`` runs in-process. A source that fits in
+            one chunk is always built in-process, since starting the pool would
+            cost more than the build.
+        advanced:
+            Run :func:`~fairmeta.advanced_nlp.enrich_text_advanced_batch` too, so
+            topic labels contribute terms as in :meth:`fit`.
+        n_features, keep:
+            Hashing space size, and the record fields kept on ``records``.
+
+        Terms are hashed (``HashingVectorizer``) inside the workers, so no
+        vocabulary has to be shared; the parent stacks the per-chunk count
+        matrices and fits IDF weights once (``TfidfTransformer``). At most
+        ``2 * n_jobs`` chunks are in flight, and only the ``keep`` fields of each
+        record are retained, so memory is bounded by the output, not the input.
+        Unlike :meth:`fit` there is no ``max_features`` cut-off, and hash
+        collisions are possible (rare at the default 2**20 features).
+        """
+        if isinstance(source, (str, Path)):
+            from .batch import iter_raw
+            source = iter_raw(Path(source))
+        n_jobs = n_jobs or os.cpu_count() or 1
+        matrices, records = [], []
+
+        def collect(result):
+            matrix, recs = result
+            if matrix is not None:
+                matrices.append(matrix)
+            records.extend(recs)
+
+        chunks = _chunks(source, chunk_size)
+        head = list(islice(chunks, 2))
+        chunks = chain(head, chunks)
+        if n_jobs == 1 or len(head) < 2:
+            for chunk in chunks:
+                collect(_build_chunk(chunk, advanced, n_features, keep))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_build_chunk, chunk, advanced, n_features, keep))
+                    if len(pending) >= 2 * n_jobs:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+
+        self = cls(records)
+        _, TfidfTransformer, Pipeline = _get_hashing()
+        if TfidfTransformer is None or not matrices:
+            logger.warning("scikit-learn missing or no records; HybridRecommender.from_source is unfitted.")
+            return self
+        import scipy.sparse as sp
+
+        tfidf = TfidfTransformer()
+        self.item_matrix = tfidf.fit_transform(sp.vstack(matrices, format="csr"))
+        self.vectorizer = Pipeline([("hash", _hashing_vectorizer(n_features)), ("tfidf", tfidf)])
+        return self
 
     def fit(self):
+        TfidfVectorizer, cosine_similarity = _get_sklearn()
         if TfidfVectorizer is None or cosine_similarity is None:
             logger.warning("scikit-learn missing; HybridRecommender.fit is a no-op.")
             return self
 
-        texts = self._combined_text()
-        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
-        self.item_matrix = self.vectorizer.fit_transform(texts)
+        self.vectorizer = TfidfVectorizer(max_features=5000, analyzer=list)
+        self.item_matrix = self.vectorizer.fit_transform(self._combined_terms())
         return self
 
     def recommend_for_index(self, idx: int, k: int = 5) -> List[Tuple[int, float]]:
@@ -66,6 +196,7 @@ class HybridRecommender:
 
         Returns a list of (row_index, score) pairs, excluding the item itself.
         """
+        cosine_similarity = _get_sklearn()[1]
         if self.item_matrix is None or cosine_similarity is None:
             return []
         if idx < 0 or idx >= self.item_matrix.shape[0]:
@@ -77,9 +208,10 @@ class HybridRecommender:
 
     def recommend_for_query(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
         """Return top-k items that best match the free‑text query."""
+        cosine_similarity = _get_sklearn()[1]
         if self.item_matrix is None or self.vectorizer is None or cosine_similarity is None:
             return []
-        vec = self.vectorizer.transform([query])
+        vec = self.vectorizer.transform([analyze(query)])
         sims = cosine_similarity(vec, self.item_matrix).flatten()
         top_idx = sims.argsort()[::-1][:k]
         return [(int(i), float(sims[i])) for i in top_idx]
@@ -1,33 +1,83 @@
 from __future__ import annotations
-from .config import REPORTS_JSON, REPORTS_MD
-from typing import Dict, Any
-import json
+from . import config
+from .catalogue import get_catalogue
+from .dedup import get_index
+from .history import get_history
+from .serialization import find_report, read_report, write_report
+from .rules import available_profiles, get_plan
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from functools import lru_cache
 
-def write_reports(rec: Dict[str, Any], scoring: Dict[str, Any]) -> None:
-    rid = rec.get("record_id","unknown")
-    (REPORTS_JSON / f"{rid}.json").write_text(json.dumps({"record":rec, "result":scoring}, indent=2), encoding="utf-8")
-    md = []
-    md.append(f"# FAIR Report — {rec.get('title','(no title)')}")
-    md.append("")
-    md.append(f"- **Record ID**: `{rid}`")
-    md.append(f"- **Identifier**: `{rec.get('identifier','')}`")
-    md.append(f"- **License**: `{rec.get('license','')}`")
-    md.append(f"- **Format**: `{rec.get('format','')}`")
-    s = scoring["scores"]
-    md.append("")
-    md.append(f"## Scores")
-    md.append(f"- **F**: {s['F']}  |  **A**: {s['A']}  |  **I**: {s['I']}  |  **R**: {s['R']}  |  **Total**: **{s['total']}**")
-    md.append("")
-    recs = []
-    checks = scoring["checks"]
-    if not checks["F"]["pid"]: recs.append("Add a persistent identifier (DOI, Handle).")
-    if not checks["F"]["keywords"]: recs.append("Provide ≥3 keywords; align to controlled vocabularies.")
-    if not checks["A"]["license_present_and_open"]: recs.append("Add an open license (e.g., CC-BY-4.0 or CC0).")
-    if not checks["A"]["contact_point"]: recs.append("Add a contact email or maintainer info.")
-    if not checks["A"]["format_open"]: recs.append("Provide machine-readable/open formats (CSV/JSON/Parquet).")
-    if not checks["I"]["vocab_alignment_hint"]: recs.append("Map keywords to common vocabularies (Schema.org/DCAT).")
-    if not checks["R"]["provenance"]: recs.append("Document provenance/methods sufficiently.")
-    if not checks["R"]["versioning"]: recs.append("Add a version string and changelog.")
-    if not checks["R"]["citation_possible"]: recs.append("Include publisher + title + PID for proper citation.")
+# Markdown is a view over the stored JSON report: it is rendered when someone
+# asks for it (Reports page, API) instead of being written for every record.
+MD_TEMPLATE = """\
+# FAIR Report — {{ record.get('title', '(no title)') }}
+
+- **Record ID**: `{{ record.get('record_id', 'unknown') }}`
+- **Identifier**: `{{ record.get('identifier', '') }}`
+- **License**: `{{ record.get('license', '') }}`
+- **Format**: `{{ record.get('format', '') }}`
+
+## Scores
+- **F**: {{ s.F }}  |  **A**: {{ s.A }}  |  **I**: {{ s.I }}  |  **R**: {{ s.R }}  |  **Total**: **{{ s.total }}**
+
+## Recommendations
+{% for r in recs %}
+- {{ r }}
+{% endfor %}
+"""
+
+@lru_cache(maxsize=1)
+def _template():
+    # compiled once, on first render, so importing this module stays cheap
+    import jinja2
+    env = jinja2.Environment(trim_blocks=True, lstrip_blocks=True, autoescape=False,
+                             undefined=jinja2.StrictUndefined)
+    return env.from_string(MD_TEMPLATE)
+
+def recommendations(checks: Dict[str, Dict[str, bool]], profile: Optional[str] = None) -> List[str]:
+    """Hints of the failed checks, in profile order; checks without a hint are skipped.
+
+    Hints come from the scoring ``profile`` when it is a bundled one, otherwise
+    (custom profiles, reports written before results named their profile)
+    from the default profile.
+    """
+    hints = get_plan(profile if profile in available_profiles() else "default").hints
+    recs = [hints[check] for dim in checks.values() for check, ok in dim.items() if not ok and check in hints]
     if not recs: recs.append("Great job! This record meets most FAIR best practices.")
-    (REPORTS_MD / f"{rid}.md").write_text("\n".join(md), encoding="utf-8")
+    return recs
+
+def render_report_markdown(rec: Dict[str, Any], scoring: Dict[str, Any]) -> str:
+    return _template().render(record=rec, s=scoring["scores"], recs=recommendations(scoring["checks"], scoring.get("profile")))
+
+@lru_cache(maxsize=512)
+def _render_cached(path: str, mtime_ns: int) -> str:
+    data = read_report(path)
+    return render_report_markdown(data["record"], data["result"])
+
+def render_markdown(rid: str) -> str:
+    """Render the Markdown report for a stored record.
+
+    Output is cached per (record, report mtime), so re-scoring a record
+    invalidates its entry. Raises ``FileNotFoundError`` for unknown records.
+    """
+    path = find_report(rid)
+    if path is None:
+        raise FileNotFoundError(f"No stored report for {rid}")
+    return _render_cached(str(path), path.stat().st_mtime_ns)
+
+def write_reports(rec: Dict[str, Any], scoring: Dict[str, Any]) -> None:
+    write_reports_many([(rec, scoring)])
+
+def write_reports_many(items: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+    """Store a batch of ``(record, scoring)`` pairs: one report file each, one catalogue
+    transaction, one score-history event each, and near-duplicate indexing."""
+    items = list(items)
+    for rec, scoring in items:
+        write_report(rec.get("record_id","unknown"), {"record":rec, "result":scoring})
+    count = get_catalogue().upsert_many(items)
+    if config.HISTORY_ENABLED:
+        get_history().record_many(items)
+    if config.DEDUP_ENABLED:
+        get_index().add_many(rec for rec, _ in items)
+    return count
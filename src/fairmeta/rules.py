@@ -0,0 +1,319 @@
+"""Declarative FAIR rule profiles compiled into shared evaluation plans.
+
+A profile lists, per FAIR dimension, named checks and the predicate each one
+uses::
+
+    {
+      "name": "default",
+      "dimensions": {
+        "F": {"pid": {"predicate": "starts_with", "field": "identifier",
+                      "prefixes": ["10.", "hdl:", "http"]}, ...},
+        ...
+      }
+    }
+
+A check is either a predicate name (``"always"``) or a mapping with a
+``predicate`` key plus its parameters, and optionally a ``hint``: the
+recommendation shown in reports when the check fails. ``all``/``any`` combine
+other predicates given under ``of``. Profiles are loaded from JSON, or YAML when PyYAML is
+installed; bundled profiles live in ``fairmeta/profiles`` and are addressed by
+name.
+
+Compilation de-duplicates predicates by name and parameters, so a predicate
+used by several checks (the PID test backs ``pid``, ``uses_identifiers`` and
+``citation_possible`` in the default profile) runs once per record and its
+result is shared. Compiled plans are cached per file and modification time.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import time
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(__file__).resolve().parent / "profiles"
+DIMENSIONS = ("F", "A", "I", "R")
+
+Predicate = Callable[[Dict[str, Any]], bool]
+ProfileRef = Union[None, str, Path, Dict[str, Any], "EvaluationPlan"]
+
+
+class ProfileError(ValueError):
+    """Raised when a rule profile cannot be loaded or compiled."""
+
+
+# --- Predicates -------------------------------------------------------------
+def _getter(field: Union[str, List[str]]) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a dotted field path; a list of paths yields the first truthy value."""
+    if isinstance(field, list):
+        getters = [_getter(f) for f in field]
+
+        def first(rec):
+            for get in getters:
+                value = get(rec)
+                if value:
+                    return value
+            return None
+        return first
+    parts = field.split(".")
+    if len(parts) == 1:
+        return lambda rec: rec.get(field)
+
+    def nested(rec):
+        value: Any = rec
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+    return nested
+
+
+def _values(values: Union[str, List[str]], ignore_case: bool = False) -> frozenset:
+    """Literal values, or ``"@NAME"`` to reference a set defined in ``config``.
+
+    Values are kept as written unless ``ignore_case``: the predicates compare
+    them against the upper-cased field, as the original checks did, so a
+    mixed-case entry such as ``"Apache-2.0"`` only matches with ``ignore_case``.
+    """
+    if isinstance(values, str) and values.startswith("@"):
+        try:
+            values = getattr(config, values[1:])
+        except AttributeError:
+            raise ProfileError(f"Unknown value set {values!r}") from None
+    return frozenset(str(v).upper() if ignore_case else str(v) for v in values)
+
+
+def _always(value: bool = True) -> Predicate:
+    return lambda rec: bool(value)
+
+
+def _non_empty(field: str) -> Predicate:
+    get = _getter(field)
+    return lambda rec: bool(get(rec))
+
+
+def _starts_with(field: str, prefixes: List[str]) -> Predicate:
+    get, prefixes_t = _getter(field), tuple(p.lower() for p in prefixes)
+    return lambda rec: str(get(rec) or "").lower().startswith(prefixes_t)
+
+
+def _min_items(field: Union[str, List[str]], min: int = 1) -> Predicate:
+    get = _getter(field)
+    return lambda rec: len(get(rec) or []) >= min
+
+
+def _min_length(field: str, min: int) -> Predicate:
+    get = _getter(field)
+    return lambda rec: len(str(get(rec) or "").strip()) >= min
+
+
+def _one_of(field: str, values: Union[str, List[str]], ignore_case: bool = False) -> Predicate:
+    get, allowed = _getter(field), _values(values, ignore_case)
+    return lambda rec: str(get(rec) or "").upper() in allowed
+
+
+def _contains_any(field: str, values: Union[str, List[str]], ignore_case: bool = False) -> Predicate:
+    """Substring match for text fields, membership for list fields."""
+    get, wanted = _getter(field), _values(values, ignore_case)
+
+    def check(rec):
+        value = get(rec) or ""
+        if isinstance(value, list):
+            return any(str(v).upper() in wanted for v in value)
+        text = str(value).upper()
+        return any(w in text for w in wanted)
+    return check
+
+
+def _resolvable(field: str, strict: bool = False) -> Predicate:
+    """Link in ``field`` answered without error when last checked.
+
+    Results come from ``enrichment.links`` (see ``fairmeta.linkcheck``). A link
+    that has not been checked counts as present-only unless ``strict``.
+    """
+    get = _getter(field)
+
+    def check(rec):
+        url = str(get(rec) or "").strip()
+        if not url:
+            return False
+        result = ((rec.get("enrichment") or {}).get("links") or {}).get(url)
+        if result is None:
+            return not strict
+        return bool(result.get("ok"))
+    return check
+
+
+PREDICATES: Dict[str, Callable[..., Predicate]] = {
+    "always": _always,
+    "non_empty": _non_empty,
+    "starts_with": _starts_with,
+    "min_items": _min_items,
+    "min_length": _min_length,
+    "one_of": _one_of,
+    "contains_any": _contains_any,
+    "resolvable": _resolvable,
+}
+COMBINATORS: Dict[str, Callable[[List[bool]], bool]] = {"all": all, "any": any}
+
+
+# --- Compilation ------------------------------------------------------------
+class EvaluationPlan:
+    """A compiled profile: distinct predicates in dependency order.
+
+    Parameters
+    ----------
+    name:
+        Profile name.
+    nodes:
+        ``(key, function, children)`` triples. Leaves have ``children=None``
+        and a record predicate; combinators list the indices of earlier nodes
+        and a function combining their results.
+    checks:
+        Per dimension, ordered ``(check_name, node_index)`` pairs.
+    fingerprint:
+        Hash of the canonical profile; changes whenever the rules change.
+    hints:
+        Per check name, the recommendation to show when it fails.
+    """
+    def __init__(self, name: str, nodes: List[Tuple[str, Callable, Optional[List[int]]]],
+                 checks: Dict[str, List[Tuple[str, int]]], fingerprint: str,
+                 hints: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.nodes = nodes
+        self.checks = checks
+        self.fingerprint = fingerprint
+        self.hints = hints or {}
+
+    def evaluate(self, rec: Dict[str, Any]) -> Dict[str, Dict[str, bool]]:
+        results: List[bool] = []
+        for _, fn, children in self.nodes:
+            results.append(fn([results[c] for c in children]) if children is not None else fn(rec))
+        return {dim: {check: results[i] for check, i in pairs} for dim, pairs in self.checks.items()}
+
+
+def _canonical(spec: Any) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(spec, str):
+        return spec, {}
+    if isinstance(spec, dict) and isinstance(spec.get("predicate"), str):
+        params = {k: v for k, v in spec.items() if k not in ("predicate", "hint")}
+        return spec["predicate"], params
+    raise ProfileError(f"Invalid check specification: {spec!r}")
+
+
+def compile_profile(spec: Dict[str, Any]) -> EvaluationPlan:
+    """Compile a profile mapping into an :class:`EvaluationPlan`."""
+    dims = spec.get("dimensions")
+    if not isinstance(dims, dict) or not dims:
+        raise ProfileError("Profile needs a non-empty 'dimensions' mapping")
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown:
+        raise ProfileError(f"Unknown dimensions {unknown}; expected a subset of {DIMENSIONS}")
+
+    nodes: List[Tuple[str, Callable, Optional[List[int]]]] = []
+    index: Dict[str, int] = {}
+
+    def add(check_spec: Any) -> int:
+        name, params = _canonical(check_spec)
+        if name in COMBINATORS:
+            children: Optional[List[int]] = [add(s) for s in params.get("of", [])]
+            key = json.dumps([name, children])
+        else:
+            children = None
+            key = json.dumps([name, params], sort_keys=True)
+        if key in index:
+            return index[key]
+        if name in COMBINATORS:
+            fn = COMBINATORS[name]
+        elif name in PREDICATES:
+            try:
+                fn = PREDICATES[name](**params)
+            except TypeError as exc:
+                raise ProfileError(f"Bad parameters for predicate {name!r}: {exc}") from None
+        else:
+            raise ProfileError(f"Unknown predicate {name!r}")
+        nodes.append((key, fn, children))
+        index[key] = len(nodes) - 1
+        return index[key]
+
+    checks: Dict[str, List[Tuple[str, int]]] = {}
+    hints: Dict[str, str] = {}
+    for dim in DIMENSIONS:
+        if dim in dims:
+            checks[dim] = [(check, add(check_spec)) for check, check_spec in dims[dim].items()]
+            hints.update((check, check_spec["hint"]) for check, check_spec in dims[dim].items()
+                         if isinstance(check_spec, dict) and check_spec.get("hint"))
+
+    fingerprint = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return EvaluationPlan(str(spec.get("name", "custom")), nodes, checks, fingerprint, hints)
+
+
+# --- Loading ----------------------------------------------------------------
+def _resolve(ref: str) -> Path:
+    path = Path(ref)
+    if path.suffix in (".json", ".yaml", ".yml") and path.exists():
+        return path
+    for suffix in (".json", ".yaml", ".yml"):
+        candidate = PROFILES_DIR / f"{ref}{suffix}"
+        if candidate.exists():
+            return candidate
+    raise ProfileError(f"Rule profile not found: {ref}")
+
+
+def _read_spec(path: Path) -> Dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml  # type: ignore
+        except ImportError:
+            raise ProfileError(f"PyYAML is required to load {path.name}") from None
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=32)
+def _load_cached(path: str, mtime_ns: int) -> EvaluationPlan:
+    plan = compile_profile(_read_spec(Path(path)))
+    logger.info("Compiled rule profile %r (%d distinct predicates)", plan.name, len(plan.nodes))
+    return plan
+
+
+# profile reference -> (monotonic time of the last mtime check, plan)
+_checked: Dict[str, Tuple[float, EvaluationPlan]] = {}
+
+
+def get_plan(profile: ProfileRef = None) -> EvaluationPlan:
+    """Return the compiled plan for a profile name, file path, mapping or plan.
+
+    ``None`` selects ``config.SCORING_PROFILE``. Plans loaded from files are
+    cached per file modification time. A name or path is resolved and its
+    file ``stat()``ed at most once per ``config.PROFILE_RECHECK_SECONDS``, so
+    scoring does no filesystem I/O in between and edits to a profile take
+    effect within that interval. File paths are for the CLI and library
+    callers; services taking a profile from a request should accept only
+    :func:`available_profiles`.
+    """
+    if isinstance(profile, EvaluationPlan):
+        return profile
+    if isinstance(profile, dict):
+        return compile_profile(profile)
+    ref, now = str(profile or config.SCORING_PROFILE), time.monotonic()
+    hit = _checked.get(ref)
+    if hit is not None and now - hit[0] < config.PROFILE_RECHECK_SECONDS:
+        return hit[1]
+    path = _resolve(ref)
+    plan = _load_cached(str(path), path.stat().st_mtime_ns)
+    _checked[ref] = (now, plan)
+    return plan
+
+
+def available_profiles() -> List[str]:
+    return sorted({p.stem for p in PROFILES_DIR.glob("*") if p.suffix in (".json", ".yaml", ".yml")})
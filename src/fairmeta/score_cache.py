@@ -0,0 +1,247 @@
+"""Memoised scoring results keyed by a canonical hash of the normalised record.
+
+Clients of ``POST /score`` often resubmit the same metadata (a form re-validated
+after every edit). ``normalize_record`` already folds away key aliases, key
+case, keyword strings vs lists and creator formats, so hashing its output —
+minus the derived ``record_id`` — gives the same key for such near-identical
+payloads.
+
+Keys also include fingerprints of the scoring profile and of the vocabularies
+in ``config`` (controlled vocabulary, open licences, machine-readable formats),
+and :data:`CACHE_VERSION`. Changing any of them produces new keys, so stale
+results are never served; the old entries age out through the LRU bound and
+TTL, and the SQLite file is emptied when it was written by another version.
+
+Only the enrich → score computation is cached: callers still persist every
+request under its own ``record_id``.
+
+Two backends are provided: an in-process LRU (per worker) and a SQLite file
+that every uvicorn worker on the host can share. Select one with
+``config.SCORE_CACHE_BACKEND`` (``memory``, ``sqlite`` or ``off``).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from . import config
+
+# Bump whenever enrich_record or the scoring output changes shape or meaning,
+# so a persistent cache never serves results computed by older code.
+CACHE_VERSION = 3
+
+
+def vocab_fingerprint() -> str:
+    """Hash of the vocabularies that enrichment and scoring read from ``config``."""
+    payload = json.dumps({
+        "vocab": config.CONTROLLED_VOCAB,
+        "licenses": sorted(config.OPEN_LICENSES),
+        "formats": sorted(config.MACHINE_READABLE_FORMATS),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def canonical_key(rec: Dict[str, Any], profile_fingerprint: str) -> str:
+    """Cache key for a normalised (not yet enriched) record."""
+    body = {k: v for k, v in rec.items() if k != "record_id"}
+    payload = json.dumps([CACHE_VERSION, profile_fingerprint, vocab_fingerprint(), body],
+                         sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Thread-safe, size-bounded LRU with per-entry TTL.
+
+    Values are stored as JSON and decoded on every hit, like the SQLite
+    backend, so callers get their own copy and mutating a response or a
+    persisted record never changes the cached entry.
+    """
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0):
+        self.maxsize, self.ttl = maxsize, ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                return None
+            self._data.move_to_end(key)
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._data[key] = (time.time(), encoded)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """LRU/TTL cache in a SQLite file, shareable between worker processes.
+
+    The size bound is enforced every ``EVICT_EVERY`` inserts per process rather
+    than on each one, so the table may briefly exceed ``maxsize`` by that much
+    per worker.
+    """
+    EVICT_EVERY = 256
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS score_cache (
+        key      TEXT PRIMARY KEY,
+        value    TEXT NOT NULL,
+        stored   REAL NOT NULL,
+        accessed REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_score_cache_accessed ON score_cache(accessed);
+    """
+
+    def __init__(self, path: Path, maxsize: int = 100000, ttl: float = 3600.0):
+        self.path, self.maxsize, self.ttl = Path(path), maxsize, ttl
+        self.evictions = self.expirations = 0
+        self._lock = threading.Lock()  # guards the counters only; SQLite serialises the writes
+        self._ready = False
+        self._inserts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        config.ensure_dir(self.path.parent)
+        con = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(self._SCHEMA)
+            with con:
+                if con.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                    con.execute("DELETE FROM score_cache")
+                    con.execute(f"PRAGMA user_version = {int(CACHE_VERSION)}")
+            self._ready = True
+        return con
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        con = self._connect()
+        try:
+            row = con.execute("SELECT value, stored FROM score_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with con:
+                if now - row[1] > self.ttl:
+                    con.execute("DELETE FROM score_cache WHERE key = ?", (key,))
+                    with self._lock:
+                        self.expirations += 1
+                    return None
+                con.execute("UPDATE score_cache SET accessed = ? WHERE key = ?", (now, key))
+        finally:
+            con.close()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        con = self._connect()
+        try:
+            with con:
+                con.execute("INSERT OR REPLACE INTO score_cache VALUES (?, ?, ?, ?)",
+                            (key, json.dumps(value, separators=(",", ":")), now, now))
+                self._inserts += 1
+                if self._inserts % self.EVICT_EVERY == 0:
+                    self._evict(con)
+        finally:
+            con.close()
+
+    def _evict(self, con: sqlite3.Connection) -> None:
+        """Drop least recently accessed rows beyond ``maxsize`` (a count scan, so run periodically)."""
+        excess = con.execute("SELECT COUNT(*) FROM score_cache").fetchone()[0] - self.maxsize
+        if excess > 0:
+            con.execute("DELETE FROM score_cache WHERE key IN (SELECT key FROM score_cache "
+                        "ORDER BY accessed LIMIT ?)", (excess,))
+            with self._lock:
+                self.evictions += excess
+
+    def clear(self) -> None:
+        con = self._connect()
+        try:
+            with con:
+                con.execute("DELETE FROM score_cache")
+        finally:
+            con.close()
+
+    def __len__(self) -> int:
+        con = self._connect()
+        try:
+            return con.execute("SELECT COUNT(*) FROM score_cache").fetchone()[0]
+        finally:
+            con.close()
+
+
+class ScoreCache:
+    """Hit/miss accounting around a cache backend.
+
+    The counters are updated from FastAPI's thread pool, under the backend's
+    lock.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = backend._lock
+        self.hits = self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.backend.set(key, value)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "maxsize": self.backend.maxsize,
+            "ttl_seconds": self.backend.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "expirations": self.backend.expirations,
+        }
+
+
+def make_cache() -> Optional[ScoreCache]:
+    """Build the cache configured in ``config``; ``None`` when caching is off."""
+    kind = config.SCORE_CACHE_BACKEND
+    if kind == "off":
+        return None
+    if kind == "sqlite":
+        return ScoreCache(SQLiteBackend(config.SCORE_CACHE_DB, config.SCORE_CACHE_SIZE, config.SCORE_CACHE_TTL))
+    if kind == "memory":
+        return ScoreCache(MemoryBackend(config.SCORE_CACHE_SIZE, config.SCORE_CACHE_TTL))
+    raise ValueError(f"Unknown score cache backend {kind!r}; expected memory, sqlite or off")
@@ -0,0 +1,125 @@
+"""Pluggable serialisation for stored reports.
+
+Reports can be written as compact JSON, gzip- or zstd-compressed JSON, or
+MessagePack. The format is chosen with ``config.REPORT_FORMAT`` (environment
+variable ``FAIRMETA_REPORT_FORMAT``) and is detected from the leading bytes on
+read, so a report store may mix formats while it is being migrated.
+
+zstd and MessagePack need the optional ``zstandard`` and ``msgpack`` packages;
+selecting them without the package installed raises a clear error, while the
+JSON-based formats always work.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import gzip
+import importlib
+import json
+
+from .config import REPORTS_JSON, REPORT_FORMAT, ensure_dir
+
+EXTENSIONS: Dict[str, str] = {
+    "json": ".json",
+    "json.gz": ".json.gz",
+    "json.zst": ".json.zst",
+    "msgpack": ".msgpack",
+}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@lru_cache(maxsize=None)
+def _require(fmt: str, package: str):
+    """Import an optional codec package on first use."""
+    try:
+        return importlib.import_module(package)
+    except ImportError:
+        raise RuntimeError(f"Report format {fmt!r} needs the optional '{package}' package "
+                           f"(pip install {package}).") from None
+
+
+def _json_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any, fmt: str = REPORT_FORMAT) -> bytes:
+    """Encode ``obj`` in one of the formats listed in ``EXTENSIONS``."""
+    if fmt == "json":
+        return _json_bytes(obj)
+    if fmt == "json.gz":
+        # mtime=0 keeps output byte-identical for identical reports
+        return gzip.compress(_json_bytes(obj), compresslevel=6, mtime=0)
+    if fmt == "json.zst":
+        return _require(fmt, "zstandard").ZstdCompressor(level=3).compress(_json_bytes(obj))
+    if fmt == "msgpack":
+        return _require(fmt, "msgpack").packb(obj, use_bin_type=True)
+    raise ValueError(f"Unknown report format {fmt!r}; expected one of {list(EXTENSIONS)}")
+
+
+def detect_format(data: bytes) -> str:
+    """Identify the encoding of ``data`` from its leading bytes."""
+    if data.startswith(_GZIP_MAGIC):
+        return "json.gz"
+    if data.startswith(_ZSTD_MAGIC):
+        return "json.zst"
+    head = data.lstrip()[:1]
+    if head in (b"{", b"["):
+        return "json"
+    # MessagePack maps/arrays: fixmap, fixarray, map16/32, array16/32
+    if data and (0x80 <= data[0] <= 0x9f or data[0] in (0xdc, 0xdd, 0xde, 0xdf)):
+        return "msgpack"
+    raise ValueError("Unrecognised report encoding")
+
+
+def loads(data: bytes) -> Any:
+    """Decode bytes produced by :func:`dumps`, whatever the format."""
+    fmt = detect_format(data)
+    if fmt == "json":
+        return json.loads(data)
+    if fmt == "json.gz":
+        return json.loads(gzip.decompress(data))
+    if fmt == "json.zst":
+        return json.loads(_require(fmt, "zstandard").ZstdDecompressor().decompress(data))
+    return _require(fmt, "msgpack").unpackb(data, raw=False)
+
+
+def report_path(rid: str, fmt: str = REPORT_FORMAT, directory: Optional[Path] = None) -> Path:
+    return Path(directory or REPORTS_JSON) / f"{rid}{EXTENSIONS[fmt]}"
+
+
+def find_report(rid: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """Locate the stored report for ``rid``, preferring the configured format."""
+    for fmt in (REPORT_FORMAT, *EXTENSIONS):
+        path = report_path(rid, fmt, directory)
+        if path.exists():
+            return path
+    return None
+
+
+def iter_report_paths(directory: Optional[Path] = None) -> Iterator[Path]:
+    """Yield every stored report file, in name order, regardless of format."""
+    directory = Path(directory or REPORTS_JSON)
+    if not directory.is_dir():
+        return
+    suffixes = tuple(EXTENSIONS.values())
+    for path in sorted(directory.iterdir()):
+        if path.name.endswith(suffixes):
+            yield path
+
+
+def write_report(rid: str, obj: Any, fmt: str = REPORT_FORMAT, directory: Optional[Path] = None) -> Path:
+    """Write a report in ``fmt`` and drop copies of it left in other formats."""
+    path = report_path(rid, fmt, directory)
+    ensure_dir(path.parent)
+    path.write_bytes(dumps(obj, fmt))
+    for other in EXTENSIONS:
+        if other != fmt:
+            report_path(rid, other, directory).unlink(missing_ok=True)
+    return path
+
+
+def read_report(path: Path) -> Any:
+    return loads(Path(path).read_bytes())
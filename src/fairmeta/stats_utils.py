@@ -1,29 +1,143 @@
-"""Utility helpers for computing summary statistics over FAIR reports."""
+"""Utility helpers for computing summary statistics over FAIR reports.
+
+:class:`ScoreSketch` is a mergeable summary of the score distribution. Scores
+are averages of boolean checks rounded to three decimals, so a fixed histogram
+with one bin per thousandth (1001 bins per dimension) represents them
+*exactly*: percentiles and histograms read from it match a full scan, its size
+does not depend on the number of records, and two sketches merge by adding
+counts. That makes it suitable for incremental maintenance (the catalogue
+updates sketches on every write, subtracting a record's previous scores) and
+for combining partitions or time windows.
+"""
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+import math
+
+from .serialization import iter_report_paths, read_report
 
-from .config import REPORTS_JSON
+SCORE_KEYS = ("F", "A", "I", "R", "total")
+BINS = 1001  # 0.000 .. 1.000 in steps of 0.001
 
 
 def load_all_scores() -> List[Dict[str, Any]]:
-    """Load all JSON reports and return their score sections.
+    """Load all stored reports and return their score sections.
 
     Returns a list of dicts each containing at least:
         { 'id': <identifier>, 'scores': {F,A,I,R,total} }
     """
     scores: List[Dict[str, Any]] = []
-    for path in sorted(Path(REPORTS_JSON).glob("*.json")):
+    for path in iter_report_paths():
         try:
-            data = json.loads(path.read_text())
+            data = read_report(path)
             entry = {
                 "file": path.name,
                 "identifier": data.get("record", {}).get("identifier", ""),
-                "scores": data.get("scores", {}),
+                "scores": data.get("result", {}).get("scores") or data.get("scores", {}),
             }
             scores.append(entry)
         except Exception:
             continue
     return scores
+
+
+def _bin(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    return max(0, min(BINS - 1, int(round(float(value) * 1000))))
+
+
+class ScoreSketch:
+    """Exact, mergeable per-dimension histogram of 3-decimal scores."""
+    def __init__(self):
+        self.counts: Dict[str, List[int]] = {k: [0] * BINS for k in SCORE_KEYS}
+        self.n: Dict[str, int] = {k: 0 for k in SCORE_KEYS}
+
+    def add(self, scores: Dict[str, Any], weight: int = 1) -> "ScoreSketch":
+        for k in SCORE_KEYS:
+            b = _bin(scores.get(k))
+            if b is not None:
+                self.counts[k][b] += weight
+                self.n[k] += weight
+        return self
+
+    def remove(self, scores: Dict[str, Any]) -> "ScoreSketch":
+        return self.add(scores, -1)
+
+    def merge(self, other: "ScoreSketch") -> "ScoreSketch":
+        for k in SCORE_KEYS:
+            mine, theirs = self.counts[k], other.counts[k]
+            for b, c in enumerate(theirs):
+                if c:
+                    mine[b] += c
+            self.n[k] += other.n[k]
+        return self
+
+    @property
+    def count(self) -> int:
+        return self.n["total"]
+
+    def mean(self, key: str = "total") -> Optional[float]:
+        n = self.n[key]
+        if n <= 0:
+            return None
+        return round(sum(b * c for b, c in enumerate(self.counts[key])) / n / 1000, 6)
+
+    def quantiles(self, key: str = "total", qs: Sequence[float] = (0.1, 0.5, 0.9)) -> List[Optional[float]]:
+        """Lower quantiles (the smallest score with at least ``q`` of records at or below it)."""
+        n = self.n[key]
+        if n <= 0:
+            return [None for _ in qs]
+        targets = sorted((max(1, math.ceil(q * n)), i) for i, q in enumerate(qs))
+        out: List[Optional[float]] = [None] * len(qs)
+        seen, t = 0, 0
+        for b, c in enumerate(self.counts[key]):
+            seen += c
+            while t < len(targets) and seen >= targets[t][0]:
+                out[targets[t][1]] = b / 1000
+                t += 1
+            if t == len(targets):
+                break
+        return out
+
+    def quantile(self, key: str = "total", q: float = 0.5) -> Optional[float]:
+        return self.quantiles(key, (q,))[0]
+
+    def histogram(self, key: str = "total", bins: int = 10) -> List[Tuple[float, float, int]]:
+        """Counts in ``bins`` equal-width buckets over [0, 1] (the last one closed)."""
+        out = [0] * bins
+        for b, c in enumerate(self.counts[key]):
+            if c:
+                out[min(bins - 1, b * bins // (BINS - 1))] += c
+        return [(i / bins, (i + 1) / bins, c) for i, c in enumerate(out)]
+
+    def summary(self, qs: Sequence[float] = (0.1, 0.5, 0.9)) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for k in SCORE_KEYS:
+            row: Dict[str, Any] = {"count": self.n[k], "mean": self.mean(k)}
+            for q, v in zip(qs, self.quantiles(k, qs)):
+                row[f"p{int(round(q * 100))}"] = v
+            out[k] = row
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-serialisable form."""
+        return {"n": dict(self.n),
+                "bins": {k: {str(b): c for b, c in enumerate(v) if c} for k, v in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ScoreSketch":
+        sketch = cls()
+        if data:
+            for k in SCORE_KEYS:
+                sketch.n[k] = int(data.get("n", {}).get(k, 0))
+                for b, c in data.get("bins", {}).get(k, {}).items():
+                    sketch.counts[k][int(b)] = int(c)
+        return sketch
+
+    @classmethod
+    def from_scores(cls, rows: Iterable[Dict[str, Any]]) -> "ScoreSketch":
+        sketch = cls()
+        for scores in rows:
+            sketch.add(scores)
+        return sketch
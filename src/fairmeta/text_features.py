@@ -0,0 +1,128 @@
+"""Shared, cached text features for a record's title, description and keywords.
+
+Basic enrichment, the advanced NLP helpers and the recommender all look at the
+same text. :class:`TextFeatures` normalises and tokenises it once and serves
+each consumer the view it needs:
+
+- ``blob`` / ``lower``: title, description and keywords joined by spaces (what
+  ``enrich_record`` scans for identifiers and vocabulary terms);
+- ``text`` / ``tokens``: title and description, and their whitespace tokens
+  with surrounding punctuation stripped (the sentiment lexicon);
+- ``terms`` / ``blob_terms`` / ``term_counts``: scikit-learn style analyser
+  output (lower-cased ``\\w\\w+`` tokens minus English stop words), which the
+  topic model and TF-IDF consume directly instead of re-tokenising.
+
+Features are cached by a hash of the content, so the same record (or the same
+text submitted twice) is only processed once per process.
+"""
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from functools import cached_property, lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import re
+import threading
+
+TOKEN_RX = re.compile(r"(?u)\b\w\w+\b")  # scikit-learn's default token_pattern
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def _stop_words() -> FrozenSet[str]:
+    try:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS  # type: ignore
+        return frozenset(ENGLISH_STOP_WORDS)
+    except Exception:
+        return frozenset()
+
+
+def analyze(text: str) -> List[str]:
+    """Tokenise like ``CountVectorizer(stop_words="english")`` does."""
+    stop = _stop_words()
+    return [t for t in TOKEN_RX.findall((text or "").lower()) if t not in stop]
+
+
+class TextFeatures:
+    """Lazily computed, immutable views of one record's text."""
+    def __init__(self, digest: str, title: str, description: str, keywords: Tuple[str, ...]):
+        self.digest, self.title, self.description, self.keywords = digest, title, description, keywords
+
+    @cached_property
+    def text(self) -> str:
+        return "\n\n".join(t for t in (self.title, self.description) if t)
+
+    @cached_property
+    def blob(self) -> str:
+        return " ".join([self.title, self.description, " ".join(self.keywords)])
+
+    @cached_property
+    def lower(self) -> str:
+        return self.blob.lower()
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        return tuple(t.strip(".,;:!?()").lower() for t in self.text.split())
+
+    @cached_property
+    def terms(self) -> Tuple[str, ...]:
+        return tuple(analyze(self.text))
+
+    @cached_property
+    def blob_terms(self) -> Tuple[str, ...]:
+        return tuple(analyze(self.blob))
+
+    @cached_property
+    def term_counts(self) -> Dict[str, int]:
+        return dict(Counter(self.terms))
+
+
+_cache: "OrderedDict[str, TextFeatures]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def features(title: Any = "", description: Any = "", keywords: Optional[Iterable[Any]] = None) -> TextFeatures:
+    """Return the (cached) :class:`TextFeatures` for the given fields."""
+    title, description = str(title or ""), str(description or "")
+    kw = tuple(str(k) for k in keywords or ())
+    h = hashlib.blake2b(digest_size=16)
+    for part in (title, description, *kw):
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\x00")
+    digest = h.hexdigest()
+    with _lock:
+        feat = _cache.get(digest)
+        if feat is not None:
+            _cache.move_to_end(digest)
+            return feat
+    feat = TextFeatures(digest, title, description, kw)
+    with _lock:
+        _cache[digest] = feat
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return feat
+
+
+def for_record(rec: Dict[str, Any]) -> TextFeatures:
+    """Features for a normalised record's title, description and keywords."""
+    return features(rec.get("title"), rec.get("description"), rec.get("keywords"))
+
+
+def build_features(records: Sequence[Dict[str, Any]], fields: Sequence[str] = ("lower", "tokens", "terms", "blob_terms")) -> List[TextFeatures]:
+    """Build features for a whole catalogue in one pass.
+
+    ``fields`` are computed eagerly so later consumers only read them; records
+    with identical text share one object.
+    """
+    out = []
+    for rec in records:
+        feat = for_record(rec)
+        for name in fields:
+            getattr(feat, name)
+        out.append(feat)
+    return out
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
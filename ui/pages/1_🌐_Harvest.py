@@ -9,7 +9,7 @@ from fairmeta.report import write_reports
 
 st.title("Harvest & Score (Realtime)")
 
-tabs = st.tabs(["Zenodo", "CKAN", "Batch CSV"])
+tabs = st.tabs(["Zenodo", "CKAN", "Batch CSV", "Delta sync"])
 
 with tabs[0]:
     st.subheader("Zenodo by DOI / record id")
@@ -55,3 +55,23 @@ with tabs[2]:
             rec = enrich_record(rec); result = score_record(rec); write_reports(rec, result)
             count += 1
         st.success(f"Processed {count} records and wrote reports ✅")
+
+with tabs[3]:
+    st.subheader("Incremental sync since last watermark")
+    st.caption("Fetches only records modified since the previous sync of the source, re-scores them, and tombstones records deleted at the source.")
+    from fairmeta.harvesters.delta import HarvestState, sync_ckan, sync_zenodo
+    kind = st.radio("Source", ["CKAN", "Zenodo"], horizontal=True)
+    if kind == "CKAN":
+        dbase = st.text_input("CKAN Base URL", value="https://data.gov.ie", key="delta_base")
+        source = f"ckan:{dbase.rstrip('/')}"
+    else:
+        community = st.text_input("Zenodo community (optional)", key="delta_comm")
+        source = f"zenodo:{community or '*'}"
+    st.write("Current watermark:", HarvestState().watermark(source) or "none (first sync is a full harvest)")
+    if st.button("Run delta sync"):
+        try:
+            stats = sync_ckan(dbase) if kind == "CKAN" else sync_zenodo(community or None)
+            st.success(f"Synced {stats['changed']} changed and {stats['deleted']} deleted records ✅")
+            st.json(stats)
+        except Exception as e:
+            st.error(f"Delta sync failed: {e}")
@@ -1,31 +1,46 @@
-import sys, pathlib, json, pandas as pd, plotly.express as px
+import sys, pathlib, math, pandas as pd, plotly.express as px
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
 import streamlit as st
-from fairmeta.config import REPORTS_JSON, REPORTS_MD
+from fairmeta.catalogue import get_catalogue
+from fairmeta.report import render_markdown, render_report_markdown
 
 st.title("Reports")
-files = sorted(REPORTS_JSON.glob("*.json"))
-if not files:
+cat = get_catalogue()
+if cat.count() == 0:
+    cat.sync_from_reports()
+if cat.count() == 0:
     st.info("No reports yet. Use the Harvest page first.")
 else:
-    rows = []
-    for f in files:
-        data = json.loads(f.read_text(encoding="utf-8"))
-        rec, sc = data["record"], data["result"]["scores"]
-        rows.append({"record_id":rec["record_id"], "title":rec.get("title",""), "id":rec.get("identifier",""),
-                     "F":sc["F"], "A":sc["A"], "I":sc["I"], "R":sc["R"], "Total":sc["total"]})
-    df = pd.DataFrame(rows)
-    st.dataframe(df, use_container_width=True)
-    st.subheader("Score Distribution")
-    fig = px.bar(df.sort_values("Total", ascending=False), x="title", y=["F","A","I","R"], barmode="group")
-    st.plotly_chart(fig, use_container_width=True)
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 1])
+    q = c1.text_input("Title contains")
+    min_total = c2.slider("Minimum total", 0.0, 1.0, 0.0, 0.05)
+    sort = c3.selectbox("Sort by", ["total", "F", "A", "I", "R", "title", "updated_at"])
+    descending = c4.checkbox("Desc", value=True)
+    page_size = st.select_slider("Rows per page", [10, 25, 50, 100], value=25)
 
-    sel = st.selectbox("Open a report", df["record_id"])
-    if sel:
-        jf = REPORTS_JSON / f"{sel}.json"
-        md = REPORTS_MD / f"{sel}.md"
-        data = json.loads(jf.read_text(encoding="utf-8"))
-        st.markdown(f"### {data['record'].get('title','(no title)')}")
-        st.json(data["result"]["scores"])
-        st.divider()
-        st.markdown(md.read_text(encoding="utf-8"))
+    total = cat.query(q=q, min_scores={"total": min_total}, limit=0)["total"]
+    pages = max(1, math.ceil(total / page_size))
+    page_no = st.number_input(f"Page (1–{pages})", min_value=1, max_value=pages, value=1)
+    page = cat.query(q=q, min_scores={"total": min_total}, sort=sort, descending=descending,
+                     limit=page_size, offset=(page_no - 1) * page_size)
+    st.caption(f"{total} matching reports")
+
+    df = pd.DataFrame(page["items"]).rename(columns={"identifier": "id", "total": "Total"})
+    if df.empty:
+        st.info("No reports match these filters.")
+    else:
+        st.dataframe(df, use_container_width=True)
+        st.subheader("Score Distribution")
+        fig = px.bar(df, x="title", y=["F","A","I","R"], barmode="group")
+        st.plotly_chart(fig, use_container_width=True)
+
+        sel = st.selectbox("Open a report", df["record_id"])
+        if sel:
+            data = cat.get(sel)
+            st.markdown(f"### {data['record'].get('title','(no title)')}")
+            st.json(data["result"]["scores"])
+            st.divider()
+            try:
+                st.markdown(render_markdown(sel))
+            except FileNotFoundError:
+                st.markdown(render_report_markdown(data["record"], data["result"]))
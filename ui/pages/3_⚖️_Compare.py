@@ -1,25 +1,61 @@
-import sys, pathlib, json, pandas as pd, plotly.express as px
+import sys, pathlib, pandas as pd, plotly.express as px
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
 import streamlit as st
-from fairmeta.config import REPORTS_JSON
+from fairmeta.catalogue import get_catalogue
+from fairmeta.history import get_history
+
+MAX_OPTIONS = 200
+
+def _pick(side: str, default_index: int):
+    q = st.text_input(f"{side}: title contains", key=f"q_{side}")
+    items = get_catalogue().query(q=q, sort="title", descending=False, limit=MAX_OPTIONS)["items"]
+    if not items:
+        st.warning(f"No reports match for {side}.")
+        return None
+    labels = [f"{it['title'] or '(no title)'} — {it['identifier']}" for it in items]
+    idx = st.selectbox(side, range(len(items)), index=min(default_index, len(items) - 1),
+                       format_func=lambda i: labels[i])
+    return items[idx]
 
 st.title("Compare Datasets")
-files = sorted(REPORTS_JSON.glob("*.json"))
-if len(files) < 2:
+cat = get_catalogue()
+if cat.count() == 0:
+    cat.sync_from_reports()
+if cat.count() < 2:
     st.info("Need at least two reports to compare. Harvest another dataset first.")
 else:
-    options = []
-    store = {}
-    for f in files:
-        d = json.loads(f.read_text(encoding="utf-8"))
-        rec, scores = d["record"], d["result"]["scores"]
-        label = f"{rec.get('title','(no title)')} — {rec.get('identifier','')}"
-        options.append(label); store[label] = scores
-    left = st.selectbox("Left", options, index=0)
-    right = st.selectbox("Right", options, index=1 if len(options)>1 else 0)
-    l, r = store[left], store[right]
-    df = pd.DataFrame([l, r], index=["Left","Right"])
-    st.dataframe(df, use_container_width=True)
-    fig = px.bar(df.reset_index().melt(id_vars="index", var_name="Metric", value_name="Score"),
-                 x="Metric", y="Score", color="index", barmode="group")
-    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Showing up to {MAX_OPTIONS} matches per side; narrow with the title filter.")
+    left, right = _pick("Left", 0), _pick("Right", 1)
+    if left and right:
+        cols = ["F", "A", "I", "R", "total"]
+        df = pd.DataFrame([{c: left[c] for c in cols}, {c: right[c] for c in cols}], index=["Left","Right"])
+        st.dataframe(df, use_container_width=True)
+        fig = px.bar(df.reset_index().melt(id_vars="index", var_name="Metric", value_name="Score"),
+                     x="Metric", y="Score", color="index", barmode="group")
+        st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("Score history")
+st.caption("Every re-score is logged; compare a record's first and latest scores.")
+target = _pick("Record", 0)
+if target:
+    events = get_history().trend(target["record_id"])
+    if not events:
+        st.info("No history recorded for this record yet.")
+    else:
+        cols = ["F", "A", "I", "R", "total"]
+        hist = pd.DataFrame(events)
+        hist["ts"] = pd.to_datetime(hist["ts"])
+        ba = pd.DataFrame([{c: events[0][c] for c in cols}, {c: events[-1][c] for c in cols}],
+                          index=[f"Before ({events[0]['ts'][:10]})", f"After ({events[-1]['ts'][:10]})"])
+        st.dataframe(ba, use_container_width=True)
+        st.plotly_chart(px.bar(ba.reset_index().melt(id_vars="index", var_name="Metric", value_name="Score"),
+                               x="Metric", y="Score", color="index", barmode="group"),
+                        use_container_width=True)
+        if len(events) > 1:
+            st.plotly_chart(px.line(hist, x="ts", y=cols, markers=True,
+                                    labels={"ts": "Scored at", "value": "Score", "variable": "Metric"}),
+                            use_container_width=True)
+        gained = sorted(set(events[-1]["passed"]) - set(events[0]["passed"]))
+        lost = sorted(set(events[0]["passed"]) - set(events[-1]["passed"]))
+        if gained or lost:
+            st.write(f"Checks gained: {', '.join(gained) or '—'}  |  lost: {', '.join(lost) or '—'}")
@@ -4,11 +4,8 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
 import streamlit as st
 import pandas as pd
 
-from fairmeta.ingest import normalize_record
-from fairmeta.enrich import enrich_record
-from fairmeta.advanced_nlp import enrich_text_advanced
 from fairmeta.recommendation import HybridRecommender
-from fairmeta.config import DATA_DIR
+from fairmeta.config import DATA_DIR, RECOMMENDER_JOBS
 
 st.title("🎯 Hybrid Recommendation Demo")
 
@@ -26,18 +23,14 @@ else:
     st.caption("Loaded sample catalogue from `data/sample_metadata.csv`.")
     st.dataframe(df_raw.head())
 
-    # Build enriched records
-    records = []
-    for _, row in df_raw.iterrows():
-        rec = normalize_record(row.to_dict())
-        rec = enrich_record(rec)
-        rec["advanced_enrichment"] = enrich_text_advanced(
-            title=rec.get("title",""),
-            description=rec.get("description",""),
-        )
-        records.append(rec)
+    # Enrich and vectorise in a small process pool (not every core of the Streamlit
+    # server); rebuilt only when the file changes
+    @st.cache_resource(show_spinner="Building recommender catalogue…")
+    def build_recommender(path: str, mtime: float) -> HybridRecommender:
+        return HybridRecommender.from_source(path, n_jobs=RECOMMENDER_JOBS)
 
-    hr = HybridRecommender(records).fit()
+    hr = build_recommender(str(sample_path), sample_path.stat().st_mtime)
+    records = hr.records
 
     mode = st.radio("Recommend by", ["Free‑text query", "Existing item"], horizontal=True)
 
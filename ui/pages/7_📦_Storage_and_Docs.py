@@ -17,7 +17,7 @@ st.subheader("Project layout")
 st.code(f"""PROJECT_ROOT = {PROJECT_ROOT}
 data/            → raw & demo catalogues (CSV, JSON)
 reports/json/    → machine‑readable FAIR + enrichment reports
-reports/md/      → human‑friendly Markdown reports
+reports/md/      → legacy Markdown exports (Markdown is now rendered on demand)
 api/             → FastAPI service (POST /score)
 ui/              → Streamlit console
 """)
@@ -40,6 +40,8 @@ st.markdown(
     *Harvest* or *Recommendation* pages at it.  
     * JSON reports under `reports/json` can be indexed by external search
     engines or harvested into a graph database.  
-    * Markdown reports under `reports/md` are ideal for human‑readable
-    documentation, data‑management plans, or repository uploads."""
+    * Markdown reports are rendered on demand from the JSON reports (Reports
+    page, or `GET /records/{record_id}/markdown` on the API), so template
+    changes apply to every record without rewriting files. They are ideal for
+    human‑readable documentation, data‑management plans, or repository uploads."""
 )
@@ -5,7 +5,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from fairmeta.stats_utils import load_all_scores
+from fairmeta.catalogue import get_catalogue
+from fairmeta.stats_utils import SCORE_KEYS
 
 st.title("📈 FAIR Statistics Dashboard")
 
@@ -15,42 +16,42 @@ st.markdown(
     act as a mini‑monitoring console for repository curation work."""
 )
 
-# Load data
-data = load_all_scores()
+cat = get_catalogue()
+if cat.count() == 0:
+    cat.sync_from_reports()
 
-if not data:
+days = [w[4:] for w in cat.sketch_windows() if w.startswith("day:")]
+scope = st.radio("Scope", ["Current catalogue", "Scoring events by day"], horizontal=True)
+if scope == "Current catalogue" or not days:
+    sketch = cat.sketch()
+else:
+    start, end = st.select_slider("Days", options=days, value=(days[0], days[-1]))
+    sketch = cat.sketch_range(start, end)
+
+if sketch.count == 0:
     st.info("No reports found yet. Generate some scores from the Harvest page first.")
 else:
-    # Prepare DataFrame
-    rows = []
-    for entry in data:
-        row = {"file": entry["file"], "identifier": entry.get("identifier", "")}
-        row.update(entry.get("scores", {}))
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-    df.columns = df.columns.str.strip()  # Clean up column names
-
-    st.subheader("All Scored Records")
-    st.dataframe(df)
-
-    # Show available columns
-    st.markdown("#### Debug: Columns in DataFrame")
-    st.write(df.columns.tolist())
-
-    expected_cols = ["F", "A", "I", "R", "total"]
-    missing_cols = [col for col in expected_cols if col not in df.columns]
-
-    if missing_cols:
-        st.warning(f"Missing columns in FAIR report: {missing_cols}")
-    else:
-        st.subheader("Average FAIR Scores")
-        avg = df[expected_cols].mean()
-        st.write(avg.to_frame("mean").T)
-
-        fig = px.bar(
-            avg.drop(labels=["total"]),
-            labels={"index": "Dimension", "value": "Mean score"},
-            title="Average FAIR Dimension Scores",
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    st.metric("Records", f"{sketch.count:,}")
+
+    st.subheader("FAIR Score Distribution")
+    summary = pd.DataFrame(sketch.summary()).T[["mean", "p10", "p50", "p90", "count"]]
+    st.dataframe(summary.style.format({"mean": "{:.3f}", "p10": "{:.3f}", "p50": "{:.3f}", "p90": "{:.3f}"}),
+                 use_container_width=True)
+
+    fig = px.bar(
+        summary.drop(index="total"), y=["p10", "p50", "p90"], barmode="group",
+        labels={"index": "Dimension", "value": "Score", "variable": "Percentile"},
+        title="FAIR Dimension Percentiles",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    dim = st.selectbox("Histogram", SCORE_KEYS, index=len(SCORE_KEYS) - 1)
+    bins = st.slider("Bins", 5, 50, 10)
+    hist = pd.DataFrame(sketch.histogram(dim, bins), columns=["lo", "hi", "count"])
+    hist["range"] = hist.apply(lambda r: f"{r.lo:.2f}–{r.hi:.2f}", axis=1)
+    st.plotly_chart(px.bar(hist, x="range", y="count", labels={"range": f"{dim} score", "count": "Records"}),
+                    use_container_width=True)
+
+    st.subheader("Lowest-scoring records")
+    page = cat.query(sort="total", descending=False, limit=50)
+    st.dataframe(pd.DataFrame(page["items"]), use_container_width=True)